@@ -6,14 +6,24 @@
 맥락적으로 분석한다.
 """
 
-import json
+import hashlib
+import pickle
+import sys
+import time
+from collections import OrderedDict
 
 import anthropic
+import orjson
+from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+from anthropic.types.messages.batch_create_params import Request
 
 from config.settings import ANTHROPIC_API_KEY
 
 client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
+# 최종 분석은 Opus로 — 밸류에이션 추론 품질이 중요
+ANALYST_MODEL = "claude-opus-4-20250514"
+
 ANALYST_SYSTEM_PROMPT = """너는 기관투자자의 IPO 리서치 애널리스트다.
 증권신고서와 수집된 데이터를 바탕으로 공모주 투자 판단에 필요한 분석을 수행한다.
 
@@ -158,6 +168,59 @@ def _get_calibration_context(company_data: dict | None = None) -> str:
 
         return "\n".join(lines)
     except Exception:
+        return ""
+
+
+# 표 형태 섹션에 남길 컬럼 (이 순서대로, 값이 있는 컬럼만)
+_FINANCIAL_COLUMNS = (
+    "year", "revenue", "operating_income", "net_income",
+    "total_assets", "total_liabilities", "total_equity", "operating_cashflow",
+    "revenue_yoy", "operating_income_yoy", "net_income_yoy", "source",
+)
+_LOCKUP_COLUMNS = ("period", "shares", "ratio", "cumulative_ratio")
+
+
+def _compact_table(rows: list[dict], columns: tuple[str, ...]) -> str:
+    """dict 목록을 컬럼 헤더 + 행 배열의 압축 JSON으로 변환한다.
+
+    행마다 key를 반복하고 들여쓰기하는 것보다 프롬프트 토큰이 훨씬 적다.
+    """
+    cols = [c for c in columns if any(r.get(c) is not None for r in rows)]
+    lines = [orjson.dumps([round(v, 4) if isinstance(v, float) else v for v in (r.get(c) for c in cols)],
+                          default=str).decode()
+             for r in rows]
+    return '{"columns": ' + orjson.dumps(cols).decode() + ', "rows": [\n' + ",\n".join(lines) + "\n]}"
+
+
+def _compact_financials(financials: list[dict]) -> str:
+    """연도별 재무 요약을 표 형태로 압축한다."""
+    return _compact_table(financials, _FINANCIAL_COLUMNS)
+
+
+def _compact_lockup(lockup: list[dict]) -> str:
+    """보호예수 스케줄에서 기간·주식수·비율만 남긴다."""
+    return _compact_table(lockup, _LOCKUP_COLUMNS)
+
+
+# 프롬프트에 JSON 블록으로 넣는 섹션 (데이터 키, 제목, 압축 함수)
+_SECTIONS = [
+    ("offering", "공모사항", None),
+    ("crawler_data", "수요예측 결과 (38.co.kr)", None),
+    ("financials", "재무제표", _compact_financials),
+    ("lockup_schedule", "유통가능주식수 (보호예수)", _compact_lockup),
+    ("business", "사업내용", None),
+    ("valuation", "밸류에이션 (Peer 비교)", None),
+]
+
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _format_data_for_prompt(data: dict) -> str:
+    """수집 데이터를 분석 프롬프트용 마크다운으로 변환한다."""
+    sections = []
+
+    # 기업 개황
+    if "company_info" in data:
         ci = data["company_info"]
         sections.append(f"""## 기업 개황
 - 회사명: {ci.get('corp_name', '')}
@@ -167,44 +230,46 @@ def _get_calibration_context(company_data: dict | None = None) -> str:
 - 주소: {ci.get('adres', '')}
 - 시장: {ci.get('corp_cls', '')}""")
 
-    # 공모사항
-    if "offering" in data:
-        sections.append(f"## 공모사항\n```json\n{json.dumps(data['offering'], ensure_ascii=False, indent=2, default=str)}\n```")
+    for key, title, compact in _SECTIONS:
+        value = data.get(key)
+        if not value:
+            continue
+        if compact and isinstance(value, list) and all(isinstance(v, dict) for v in value):
+            body = compact(value)
+        else:
+            body = orjson.dumps(value, option=_JSON_OPTS, default=str).decode()
+        sections.append(f"## {title}\n```json\n{body}\n```")
 
-    # 38.co.kr 데이터 (기관경쟁률, 확약 등)
-    if "crawler_data" in data and data["crawler_data"]:
-        sections.append(f"## 수요예측 결과 (38.co.kr)\n```json\n{json.dumps(data['crawler_data'], ensure_ascii=False, indent=2, default=str)}\n```")
+    return "\n\n".join(sections)
 
-    # 재무제표
-    if "financials" in data:
-        sections.append(f"## 재무제표\n```json\n{json.dumps(data['financials'], ensure_ascii=False, indent=2, default=str)}\n```")
 
-    # 유통가능주식수
-    if "lockup_schedule" in data:
-        sections.append(f"## 유통가능주식수 (보호예수)\n```json\n{json.dumps(data['lockup_schedule'], ensure_ascii=False, indent=2, default=str)}\n```")
+# 같은 데이터로 재시도·재실행할 때 다시 직렬화하지 않도록 데이터 해시별로 보관 (LRU)
+_PROMPT_CACHE: OrderedDict[str, str] = OrderedDict()
+_PROMPT_CACHE_SIZE = 32
 
-    # 사업내용
-    if "business" in data:
-        sections.append(f"## 사업내용\n```json\n{json.dumps(data['business'], ensure_ascii=False, indent=2, default=str)}\n```")
 
-    # Valuation
-    if "valuation" in data:
-        sections.append(f"## 밸류에이션 (Peer 비교)\n```json\n{json.dumps(data['valuation'], ensure_ascii=False, indent=2, default=str)}\n```")
+def _format_data_cached(data: dict) -> str:
+    """_format_data_for_prompt 결과를 데이터 내용 해시로 캐시한다."""
+    try:
+        key = hashlib.blake2b(pickle.dumps(data, protocol=5), digest_size=16).hexdigest()
+    except Exception:
+        # pickle 불가능한 값이 섞여 있으면 캐시 없이 처리
+        return _format_data_for_prompt(data)
 
-    return "\n\n".join(sections)
+    if key in _PROMPT_CACHE:
+        _PROMPT_CACHE.move_to_end(key)
+        return _PROMPT_CACHE[key]
 
+    formatted = _format_data_for_prompt(data)
+    _PROMPT_CACHE[key] = formatted
+    if len(_PROMPT_CACHE) > _PROMPT_CACHE_SIZE:
+        _PROMPT_CACHE.popitem(last=False)
+    return formatted
 
-def generate_analysis(data: dict, company_name: str) -> str:
-    """수집된 모든 데이터를 기반으로 종합 분석 리포트를 생성한다.
 
-    Args:
-        data: 파이프라인에서 수집·파싱한 전체 데이터
-        company_name: 분석 대상 회사명
-
-    Returns:
-        마크다운 형식의 종합 분석 리포트
-    """
-    formatted = _format_data_for_prompt(data)
+def _build_user_prompt(data: dict, company_name: str) -> str:
+    """분석 요청 프롬프트(수집 데이터 + 캘리브레이션 + 리포트 양식)를 만든다."""
+    formatted = _format_data_cached(data)
     calibration_ctx = _get_calibration_context(company_data=data)
 
     user_prompt = f"""아래는 '{company_name}'의 IPO 관련 수집 데이터입니다.
@@ -306,17 +371,94 @@ def generate_analysis(data: dict, company_name: str) -> str:
 **현 공모가 대비**: [고평가 XX% / 적정 / 저평가 XX%]
 **참여 권고**: [구체적 참여 전략. 예: "XX,XXX원 이하에서 제한적 참여" 또는 "참여 불가 — 현 공모가 기준 XX% 고평가"]
 """
+    return user_prompt
+
+
+def generate_analysis(data: dict, company_name: str, echo: bool = True) -> str:
+    """수집된 모든 데이터를 기반으로 종합 분석 리포트를 생성한다.
+
+    Args:
+        data: 파이프라인에서 수집·파싱한 전체 데이터
+        company_name: 분석 대상 회사명
+        echo: 생성되는 본문을 콘솔에 실시간 출력할지 (여러 종목 동시 실행 시 False)
+
+    Returns:
+        마크다운 형식의 종합 분석 리포트
+    """
+    user_prompt = _build_user_prompt(data, company_name)
 
-    # 최종 분석은 Opus로 — 밸류에이션 추론 품질이 중요
-    ANALYST_MODEL = "claude-opus-4-20250514"
     print(f"[AI 분석] 종합 리포트 생성 중... (model: {ANALYST_MODEL})")
-    resp = client.messages.create(
+    # 스트리밍으로 받아 생성되는 대로 콘솔에 출력
+    chunks: list[str] = []
+    with client.messages.stream(
         model=ANALYST_MODEL,
         max_tokens=8192,
         system=ANALYST_SYSTEM_PROMPT,
         messages=[{"role": "user", "content": user_prompt}],
-    )
-
-    report = resp.content[0].text
+    ) as stream:
+        for text in stream.text_stream:
+            chunks.append(text)
+            if echo:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+    if echo:
+        sys.stdout.write("\n")
+
+    report = "".join(chunks)
     print(f"[AI 분석] 리포트 생성 완료 ({len(report):,}자)")
     return report
+
+
+def generate_analysis_batch(items: list[tuple[str, dict]]) -> dict[str, str]:
+    """여러 종목의 리포트를 Message Batches API로 한 번에 생성한다.
+
+    대화형 응답이 필요 없는 일괄 분석용 (비용 50% 절감, 별도 rate limit).
+    결과가 나올 때까지 대기하므로 수 분~수십 분이 걸릴 수 있다.
+
+    Args:
+        items: (회사명, 수집 데이터) 목록
+
+    Returns:
+        {회사명: 마크다운 리포트} — 실패한 종목은 제외
+    """
+    if not items:
+        return {}
+
+    # custom_id는 영문/숫자/-/_ 만 허용되므로 인덱스로 매핑
+    id_to_name: dict[str, str] = {}
+    requests = []
+    for i, (company_name, data) in enumerate(items):
+        custom_id = f"ipo-{i}"
+        id_to_name[custom_id] = company_name
+        requests.append(Request(
+            custom_id=custom_id,
+            params=MessageCreateParamsNonStreaming(
+                model=ANALYST_MODEL,
+                max_tokens=8192,
+                system=ANALYST_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": _build_user_prompt(data, company_name)}],
+            ),
+        ))
+
+    batch = client.messages.batches.create(requests=requests)
+    print(f"[AI 분석] 배치 제출: {batch.id} ({len(requests)}건, model: {ANALYST_MODEL})")
+
+    # 완료될 때까지 지수 백오프로 폴링 (최대 5분 간격)
+    delay = 10
+    while batch.processing_status != "ended":
+        time.sleep(delay)
+        delay = min(delay * 2, 300)
+        batch = client.messages.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        print(f"[AI 분석] 배치 진행 중... (완료 {counts.succeeded + counts.errored}/{len(requests)})")
+
+    reports: dict[str, str] = {}
+    for entry in client.messages.batches.results(batch.id):
+        company_name = id_to_name.get(entry.custom_id, entry.custom_id)
+        if entry.result.type != "succeeded":
+            print(f"[AI 분석] {company_name} 리포트 실패: {entry.result.type}")
+            continue
+        reports[company_name] = entry.result.message.content[0].text
+
+    print(f"[AI 분석] 배치 완료: {len(reports)}/{len(requests)}건 생성")
+    return reports
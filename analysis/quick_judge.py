@@ -29,7 +29,7 @@ from collectors.dart_api import (
 )
 from parsers.financial import build_financial_summary, calc_growth_rates
 from parsers.offering import parse_equity_registration
-from parsers.llm_parser import parse_full_filing
+from parsers.llm_parser import parse_full_filing_sync
 
 client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
@@ -162,7 +162,7 @@ def collect_dart_data(company_name: str) -> dict | None:
         try:
             filing_dir = download_document(rcept_no)
             if filing_dir:
-                parsed = parse_full_filing(filing_dir, need_financials=not has_financials)
+                parsed = parse_full_filing_sync(filing_dir, need_financials=not has_financials)
                 collected.update(parsed)
 
                 # LLM 추출 재무제표 통합
@@ -4,14 +4,17 @@
 DART API에서 제공하지 않는 데이터를 가져온다.
 """
 
+import functools
 import re
 import ssl
-import time
 import warnings
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from urllib3.util.ssl_ import create_urllib3_context
 
 # 38.co.kr SSL 인증서 경고 숨김
@@ -25,6 +28,9 @@ HEADERS = {
     )
 }
 
+_HREF_RE = re.compile(r"\?o=v&no=(\d+)")
+_NO_RE = re.compile(r"no=(\d+)")
+
 
 class _LegacySSLAdapter(HTTPAdapter):
     """38.co.kr처럼 오래된 SSL을 사용하는 사이트 대응."""
@@ -37,18 +43,33 @@ class _LegacySSLAdapter(HTTPAdapter):
         return super().init_poolmanager(*args, **kwargs)
 
 
-def _get_session() -> requests.Session:
+def _build_session() -> requests.Session:
     session = requests.Session()
-    session.mount("https://", _LegacySSLAdapter())
+    session.mount("https://", _LegacySSLAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ))
     session.headers.update(HEADERS)
     return session
 
 
-def _get_soup(url: str) -> BeautifulSoup:
-    session = _get_session()
-    resp = session.get(url, timeout=15, verify=False)
-    resp.encoding = "euc-kr"
-    return BeautifulSoup(resp.text, "html.parser")
+# 모듈 단위로 한 번만 생성 — 같은 호스트로의 연결(keep-alive)을 재사용한다
+_SESSION = _build_session()
+
+
+def _fetch(url: str) -> bytes:
+    return _SESSION.get(url, timeout=15, verify=False).content
+
+
+def _get_tree(url: str) -> lxml_html.HtmlElement:
+    """페이지를 euc-kr로 디코딩해 lxml 트리로 반환한다."""
+    return lxml_html.document_fromstring(_fetch(url).decode("euc-kr", "replace"))
+
+
+def _text(el: lxml_html.HtmlElement) -> str:
+    """요소의 텍스트 조각을 각각 strip해서 이어 붙인다."""
+    return "".join(t.strip() for t in el.itertext())
 
 
 def _clean_number(text: str) -> str:
@@ -56,6 +77,53 @@ def _clean_number(text: str) -> str:
     return re.sub(r"[,\s]", "", text.strip())
 
 
+# ---------------------------------------------------------------------------
+# 목록 페이지 공통 (병렬 수집 + 행 파싱)
+# ---------------------------------------------------------------------------
+
+
+def _fetch_page(o: str, page: int) -> lxml_html.HtmlElement:
+    """목록 페이지 한 장을 가져온다. (o=r1: 수요예측결과, o=r: 수요예측일정)"""
+    return _get_tree(f"{BASE_URL}/html/fund/index.htm?o={o}&page={page}")
+
+
+def _fetch_pages(o: str, pages: int) -> list[lxml_html.HtmlElement]:
+    """목록 페이지 1~pages를 스레드 풀로 동시에 가져온다 (페이지 순서 유지)."""
+    with ThreadPoolExecutor(max_workers=max(1, min(pages, 4))) as executor:
+        return list(executor.map(lambda page: _fetch_page(o, page), range(1, pages + 1)))
+
+
+def _parse_listing_page(tree: lxml_html.HtmlElement, min_cols: int) -> list[tuple[str, str, list[str]]]:
+    """종목 상세 링크가 있는 행만 골라 (종목명, no, 셀 텍스트 목록)으로 반환한다."""
+    rows = []
+    for a_tag in tree.xpath("//a[contains(@href, '?o=v&no=')]"):
+        href = a_tag.get("href", "")
+        if not _HREF_RE.search(href):
+            continue
+        tr = next(a_tag.iterancestors("tr"), None)
+        if tr is None:
+            continue
+        cols = tr.xpath(".//td")
+        if len(cols) < min_cols:
+            continue
+
+        no_match = _NO_RE.search(href)
+        name = _text(a_tag)
+        if not name:
+            continue
+
+        rows.append((
+            name,
+            no_match.group(1) if no_match else "",
+            [_text(c) for c in cols],
+        ))
+    return rows
+
+
+def _col(texts: list[str], idx: int) -> str:
+    return texts[idx] if len(texts) > idx else ""
+
+
 # ---------------------------------------------------------------------------
 # 수요예측 결과 목록 (기관경쟁률, 확약비율 포함)
 # ---------------------------------------------------------------------------
@@ -74,51 +142,42 @@ def get_demand_forecast_list(pages: int = 3) -> list[dict]:
     td[6]: 의무보유확약(%)
     td[7]: 주관사
     """
-    results = []
-    for page in range(1, pages + 1):
-        url = f"{BASE_URL}/html/fund/index.htm?o=r1&page={page}"
-        soup = _get_soup(url)
+    # 같은 no는 처음 나온 행만 유지 (수집과 동시에 중복 제거)
+    unique: dict[str, dict] = {}
+    for tree in _fetch_pages("r1", pages):
+        for item in _forecast_rows(tree):
+            unique.setdefault(item["no"], item)
+    results = list(unique.values())
 
-        # 종목 상세 링크가 있는 행만 필터
-        for a_tag in soup.find_all("a", href=re.compile(r"\?o=v&no=\d+")):
-            tr = a_tag.find_parent("tr")
-            if not tr:
-                continue
-            cols = tr.find_all("td")
-            if len(cols) < 6:
-                continue
+    print(f"[38.co.kr] 수요예측 목록 {len(results)}건 수집")
+    return results
 
-            href = a_tag.get("href", "")
-            no_match = re.search(r"no=(\d+)", href)
-            name = a_tag.get_text(strip=True)
-            if not name:
-                continue
 
-            results.append({
-                "name": name,
-                "no": no_match.group(1) if no_match else "",
-                "demand_date": cols[1].get_text(strip=True) if len(cols) > 1 else "",
-                "offering_price_range": cols[2].get_text(strip=True) if len(cols) > 2 else "",
-                "confirmed_price": cols[3].get_text(strip=True) if len(cols) > 3 else "",
-                "first_price": cols[4].get_text(strip=True) if len(cols) > 4 else "",
-                "competition_rate": cols[5].get_text(strip=True) if len(cols) > 5 else "",
-                "commitment_rate": cols[6].get_text(strip=True) if len(cols) > 6 else "",
-                "underwriter": cols[7].get_text(strip=True) if len(cols) > 7 else "",
-            })
-
-        time.sleep(0.5)
-
-    # 중복 제거 (같은 no)
-    seen = set()
-    unique = []
-    for item in results:
-        if item["no"] and item["no"] not in seen:
-            seen.add(item["no"])
-            unique.append(item)
-    results = unique
+def iter_demand_forecast_pages(pages: int = 3) -> Iterator[list[dict]]:
+    """수요예측결과 목록을 한 페이지씩 가져와 yield한다.
 
-    print(f"[38.co.kr] 수요예측 목록 {len(results)}건 수집")
-    return results
+    찾는 종목이 앞 페이지에 있으면 호출 측에서 중단해 나머지 요청을 생략할 수 있다.
+    """
+    for page in range(1, pages + 1):
+        yield _forecast_rows(_fetch_page("r1", page))
+
+
+def _forecast_rows(tree: lxml_html.HtmlElement) -> list[dict]:
+    return [
+        {
+            "name": name,
+            "no": no,
+            "demand_date": _col(texts, 1),
+            "offering_price_range": _col(texts, 2),
+            "confirmed_price": _col(texts, 3),
+            "first_price": _col(texts, 4),
+            "competition_rate": _col(texts, 5),
+            "commitment_rate": _col(texts, 6),
+            "underwriter": _col(texts, 7),
+        }
+        for name, no, texts in _parse_listing_page(tree, min_cols=6)
+        if no
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -139,83 +198,93 @@ def get_demand_schedule_list(pages: int = 2) -> list[dict]:
     td[4]: 공모금액(백만)
     td[5]: 주간사
     """
-    results = []
-    for page in range(1, pages + 1):
-        url = f"{BASE_URL}/html/fund/index.htm?o=r&page={page}"
-        soup = _get_soup(url)
+    # 같은 no는 처음 나온 행만 유지 (수집과 동시에 중복 제거)
+    unique: dict[str, dict] = {}
+    for tree in _fetch_pages("r", pages):
+        for item in _schedule_rows(tree):
+            unique.setdefault(item["no"], item)
+    results = list(unique.values())
 
-        for a_tag in soup.find_all("a", href=re.compile(r"\?o=v&no=\d+")):
-            tr = a_tag.find_parent("tr")
-            if not tr:
-                continue
-            cols = tr.find_all("td")
-            if len(cols) < 5:
-                continue
+    print(f"[38.co.kr] 수요예측 일정 {len(results)}건 수집")
+    return results
 
-            href = a_tag.get("href", "")
-            no_match = re.search(r"no=(\d+)", href)
-            name = a_tag.get_text(strip=True)
-            if not name:
-                continue
 
-            results.append({
-                "name": name,
-                "no": no_match.group(1) if no_match else "",
-                "demand_date": cols[1].get_text(strip=True) if len(cols) > 1 else "",
-                "offering_price_range": cols[2].get_text(strip=True) if len(cols) > 2 else "",
-                "confirmed_price": cols[3].get_text(strip=True) if len(cols) > 3 else "",
-                "offering_amount_million": cols[4].get_text(strip=True) if len(cols) > 4 else "",
-                "underwriter": cols[5].get_text(strip=True) if len(cols) > 5 else "",
-            })
-
-        time.sleep(0.5)
-
-    # 중복 제거
-    seen = set()
-    unique = []
-    for item in results:
-        if item["no"] and item["no"] not in seen:
-            seen.add(item["no"])
-            unique.append(item)
-    results = unique
+def iter_demand_schedule_pages(pages: int = 2) -> Iterator[list[dict]]:
+    """수요예측일정 목록을 한 페이지씩 가져와 yield한다."""
+    for page in range(1, pages + 1):
+        yield _schedule_rows(_fetch_page("r", page))
 
-    print(f"[38.co.kr] 수요예측 일정 {len(results)}건 수집")
-    return results
+
+def _schedule_rows(tree: lxml_html.HtmlElement) -> list[dict]:
+    return [
+        {
+            "name": name,
+            "no": no,
+            "demand_date": _col(texts, 1),
+            "offering_price_range": _col(texts, 2),
+            "confirmed_price": _col(texts, 3),
+            "offering_amount_million": _col(texts, 4),
+            "underwriter": _col(texts, 5),
+        }
+        for name, no, texts in _parse_listing_page(tree, min_cols=5)
+        if no
+    ]
 
 
 # ---------------------------------------------------------------------------
 # 종목 상세 페이지
 # ---------------------------------------------------------------------------
 
+# 주요 필드 매핑 (정확도를 위해 key 길이를 제한하여 네비게이션 텍스트 제외)
+_FIELD_MAP = {
+    "확정공모가": "confirmed_price",
+    "공모가": "offering_price_range",
+    "공모주식수": "offering_shares",
+    "상장예정주식수": "total_shares",
+    "기관경쟁률": "institutional_competition",
+    "의무보유확약": "lockup_commitment",
+    "의무보유확약비율": "lockup_commitment",
+    "수요예측일": "demand_forecast_date",
+    "청약일": "subscription_date",
+    "환불일": "refund_date",
+    "상장일": "listing_date",
+    "상장예정일": "listing_date",
+    "주간사": "lead_underwriter",
+    "주관사": "lead_underwriter",
+    "대표주관": "lead_underwriter",
+}
+_FIELD_RE = re.compile("|".join(map(re.escape, _FIELD_MAP)))
 
+
+@functools.lru_cache(maxsize=256)
 def get_ipo_detail(no: str) -> dict:
-    """38.co.kr 종목 상세페이지에서 데이터를 파싱한다."""
+    """38.co.kr 종목 상세페이지에서 데이터를 파싱한다.
+
+    같은 종목을 반복 조회하지 않도록 프로세스 내에서 no별로 캐시한다.
+    (반환된 dict는 공유되므로 수정하지 말 것)
+    """
     url = f"{BASE_URL}/html/fund/?o=v&no={no}"
-    soup = _get_soup(url)
+    tree = _get_tree(url)
 
     detail: dict = {"url": url}
 
     # 정보 테이블만 필터 (2~4칸 key-value 구조, 네비게이션/사이드바 제외)
     all_rows: list[tuple[str, str]] = []
 
-    for table in soup.find_all("table"):
-        rows = table.find_all("tr")
-        if not rows:
+    for table in tree.iter("table"):
+        # 행별 셀 목록 (중첩 테이블의 행/셀도 포함)
+        row_cells = [tr.xpath(".//td | .//th") for tr in table.xpath(".//tr")]
+        if not row_cells:
             continue
         # 네비게이션/메뉴 테이블 제외: 셀이 너무 많거나 텍스트가 지나치게 긴 행
-        valid_rows = 0
-        for tr in rows:
-            cells = tr.find_all(["td", "th"])
-            if 2 <= len(cells) <= 6:
-                valid_rows += 1
+        valid_rows = sum(1 for cells in row_cells if 2 <= len(cells) <= 6)
         if valid_rows < 2:
             continue
 
-        for tr in rows:
-            cells = tr.find_all(["td", "th"])
-            texts = [c.get_text(strip=True) for c in cells]
-            if not (2 <= len(texts) <= 6):
+        for cells in row_cells:
+            if not (2 <= len(cells) <= 6):
                 continue
+            texts = [_text(c) for c in cells]
             # key-value 쌍 추출 (2칸씩)
             for i in range(0, len(texts) - 1, 2):
                 key = texts[i]
@@ -224,30 +293,13 @@ def get_ipo_detail(no: str) -> dict:
                 if key and len(key) <= 20 and len(val) <= 200:
                     all_rows.append((key, val))
 
-    # 주요 필드 매핑 (정확도를 위해 key 길이를 제한하여 네비게이션 텍스트 제외)
-    field_map = {
-        "확정공모가": "confirmed_price",
-        "공모가": "offering_price_range",
-        "공모주식수": "offering_shares",
-        "상장예정주식수": "total_shares",
-        "기관경쟁률": "institutional_competition",
-        "의무보유확약": "lockup_commitment",
-        "의무보유확약비율": "lockup_commitment",
-        "수요예측일": "demand_forecast_date",
-        "청약일": "subscription_date",
-        "환불일": "refund_date",
-        "상장일": "listing_date",
-        "상장예정일": "listing_date",
-        "주간사": "lead_underwriter",
-        "주관사": "lead_underwriter",
-        "대표주관": "lead_underwriter",
-    }
-
+    # 주요 필드 매핑 — key에서 가장 앞에 나오는 패턴 하나로 결정
     for key, val in all_rows:
-        for pattern, field in field_map.items():
-            if pattern in key and val:
-                detail[field] = val
-                break
+        if not val:
+            continue
+        m = _FIELD_RE.search(key)
+        if m:
+            detail[_FIELD_MAP[m.group(0)]] = val
 
     # 배정비율 파싱 (기관/일반/우리사주)
     for key, val in all_rows:
@@ -287,18 +339,20 @@ def _enrich_from_detail(result: dict, no: str) -> None:
         print(f"  상세 페이지 파싱 실패 (무시): {e}")
 
 
-def search_by_name(company_name: str, pages: int = 5) -> dict | None:
+def search_by_name(company_name: str, pages: int = 5, want_detail: bool = True) -> dict | None:
     """종목명으로 38.co.kr에서 검색하여 데이터를 반환한다.
 
     1) 수요예측 결과 페이지(o=r1)에서 검색 — 경쟁률, 확약비율 등 포함
     2) 없으면 수요예측 일정 페이지(o=r)에서 검색 — 예정/진행 중 종목
-    두 경우 모두 상세 페이지에서 추가 정보를 보완한다.
+    want_detail이면 상세 페이지에서 청약일·상장일·배정비율 등을 보완한다.
+    목록 데이터(경쟁률, 확약비율, 공모가, 주관사)만 필요하면 False로 상세 요청을 생략한다.
     """
     # --- 1) 수요예측 결과 페이지 (경쟁률, 확약비율 있음) ---
-    listings = get_demand_forecast_list(pages=pages)
-
-    for item in listings:
-        if _match_name(company_name, item["name"]):
+    # 페이지 단위로 가져오며 찾으면 바로 중단
+    for listings in iter_demand_forecast_pages(pages=pages):
+        for item in listings:
+            if not _match_name(company_name, item["name"]):
+                continue
             print(f"[38.co.kr] '{company_name}' 발견 (수요예측 결과) → no={item['no']}")
 
             result = {
@@ -313,14 +367,15 @@ def search_by_name(company_name: str, pages: int = 5) -> dict | None:
                 "list_info": item,
             }
 
-            _enrich_from_detail(result, item.get("no", ""))
+            if want_detail:
+                _enrich_from_detail(result, item.get("no", ""))
             return result
 
     # --- 2) 수요예측 일정 페이지 (예정/진행 중 종목) ---
-    schedule = get_demand_schedule_list(pages=2)
-
-    for item in schedule:
-        if _match_name(company_name, item["name"]):
+    for schedule in iter_demand_schedule_pages(pages=2):
+        for item in schedule:
+            if not _match_name(company_name, item["name"]):
+                continue
             print(f"[38.co.kr] '{company_name}' 발견 (수요예측 일정) → no={item['no']}")
 
             result = {
@@ -336,7 +391,8 @@ def search_by_name(company_name: str, pages: int = 5) -> dict | None:
                 "list_info": item,
             }
 
-            _enrich_from_detail(result, item.get("no", ""))
+            if want_detail:
+                _enrich_from_detail(result, item.get("no", ""))
             return result
 
     print(f"[38.co.kr] '{company_name}' 찾지 못함")
@@ -4,14 +4,155 @@
 정형 데이터를 가져온다.
 """
 
-import io
-import xml.etree.ElementTree as ET
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import tempfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
 import httpx
+import orjson
+from lxml import etree
 
-from config.settings import CORP_CODES_DIR, DART_API_KEY, DART_BASE_URL
+from config.settings import CACHE_DIR, CORP_CODES_DIR, DART_API_KEY, DART_BASE_URL
+
+
+# ---------------------------------------------------------------------------
+# HTTP 클라이언트 (연결 재사용 + HTTP/2)
+# ---------------------------------------------------------------------------
+
+# 연결 풀 크기 / 연결 실패 시 재시도 횟수 (동기·비동기 공통)
+_POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+_CONNECT_RETRIES = 3
+
+_CLIENT = httpx.Client(
+    base_url=DART_BASE_URL,
+    params={"crtfc_key": DART_API_KEY},
+    timeout=15,
+    transport=httpx.HTTPTransport(http2=True, limits=_POOL_LIMITS, retries=_CONNECT_RETRIES),
+)
+
+# DART 호출 제한을 고려한 비동기 동시 요청 수 상한
+_ASYNC_CONCURRENCY = 5
+
+# AsyncClient·Semaphore는 이벤트 루프에 묶이므로 루프별로 하나씩 만든다
+_async_state: tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, asyncio.Semaphore] | None = None
+
+
+def _get_async_client() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    global _async_state
+    loop = asyncio.get_running_loop()
+    if _async_state is None or _async_state[0] is not loop:
+        _async_state = (loop, httpx.AsyncClient(
+            base_url=DART_BASE_URL,
+            params={"crtfc_key": DART_API_KEY},
+            timeout=15,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=_POOL_LIMITS, retries=_CONNECT_RETRIES),
+        ), asyncio.Semaphore(_ASYNC_CONCURRENCY))
+    return _async_state[1], _async_state[2]
+
+
+async def aclose_async_client() -> None:
+    """현재 이벤트 루프에서 만든 AsyncClient를 닫는다.
+
+    루프가 바뀌면 새 클라이언트를 만들므로, asyncio.run 하나가 끝나기 전에 호출해
+    연결 풀을 남기지 않는다.
+    """
+    global _async_state
+    if _async_state is not None and _async_state[0] is asyncio.get_running_loop():
+        client = _async_state[1]
+        _async_state = None
+        await client.aclose()
+
+
+async def _aget(url: str, **kwargs) -> httpx.Response:
+    """동시 요청 수를 제한하며 비동기 GET."""
+    client, sem = _get_async_client()
+    async with sem:
+        return await client.get(url, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# 디스크 캐시 (하루 단위로만 바뀌는 DART 응답 재사용)
+# ---------------------------------------------------------------------------
+
+_disk_cache_enabled = True
+_CACHE_MISS = object()
+
+
+def set_disk_cache(enabled: bool) -> None:
+    """디스크 캐시 읽기를 켜고 끈다 (--no-cache). 꺼도 새 응답은 저장한다."""
+    global _disk_cache_enabled
+    _disk_cache_enabled = enabled
+
+
+def disk_cache(namespace: str, ttl: int = 86400):
+    """함수 결과를 CACHE_DIR/dart/<namespace>/ 아래 pickle로 저장하는 데코레이터.
+
+    키는 기본값까지 채운 인자 → 같은 namespace를 쓰는 동기/비동기 버전이 캐시를 공유한다.
+    실패 응답(None, 빈 목록)은 저장하지 않는다.
+    """
+    def decorator(func):
+        sig = inspect.signature(func)
+
+        def _path(args, kwargs) -> Path:
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = hashlib.blake2b(
+                repr(sorted(bound.arguments.items())).encode(), digest_size=16,
+            ).hexdigest()
+            return CACHE_DIR / "dart" / namespace / f"{key}.pkl"
+
+        def _load(path: Path):
+            if not _disk_cache_enabled:
+                return _CACHE_MISS
+            try:
+                if time.time() - path.stat().st_mtime < ttl:
+                    value = pickle.loads(path.read_bytes())
+                    print(f"[DART] 캐시 사용: {namespace}")
+                    return value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            return _CACHE_MISS
+
+        def _store(path: Path, value) -> None:
+            if not value:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(pickle.dumps(value, protocol=5))
+            tmp.replace(path)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                path = _path(args, kwargs)
+                value = _load(path)
+                if value is _CACHE_MISS:
+                    value = await func(*args, **kwargs)
+                    _store(path, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = _path(args, kwargs)
+            value = _load(path)
+            if value is _CACHE_MISS:
+                value = func(*args, **kwargs)
+                _store(path, value)
+            return value
+        return wrapper
+
+    return decorator
 
 
 # ---------------------------------------------------------------------------
@@ -19,6 +160,8 @@ from config.settings import CORP_CODES_DIR, DART_API_KEY, DART_BASE_URL
 # ---------------------------------------------------------------------------
 
 _corp_code_cache: dict[str, dict] | None = None
+_corp_gram_index: dict[str, list[str]] | None = None  # 2-gram → 회사명 목록 (로드 순서)
+_CORP_CODES_MAX_AGE = 7 * 86400  # 기업코드 마스터 갱신 주기 (신규 상장·사명 변경 반영)
 
 
 def _load_corp_codes() -> dict[str, dict]:
@@ -31,12 +174,27 @@ def _load_corp_codes() -> dict[str, dict]:
     if not cache_file.exists():
         print("[DART] 기업코드 마스터 다운로드 중...")
         _download_corp_codes(cache_file)
-
-    tree = ET.parse(cache_file)
-    root = tree.getroot()
-
+    elif time.time() - cache_file.stat().st_mtime > _CORP_CODES_MAX_AGE:
+        # 오래된 마스터는 갱신하되, 실패하면 기존 파일로 계속 진행
+        print("[DART] 기업코드 마스터 갱신 중...")
+        try:
+            _download_corp_codes(cache_file)
+        except Exception as e:
+            print(f"[DART] 기업코드 갱신 실패, 기존 파일 사용: {e}")
+
+    # XML보다 최신인 pickle이 있으면 XML 파싱을 건너뛴다
+    pickle_file = CORP_CODES_DIR / "corp_codes.pkl"
+    if pickle_file.exists() and pickle_file.stat().st_mtime >= cache_file.stat().st_mtime:
+        try:
+            with pickle_file.open("rb") as f:
+                _corp_code_cache = pickle.load(f)
+            return _corp_code_cache
+        except Exception as e:
+            print(f"[DART] 기업코드 캐시 로드 실패, XML 재파싱: {e}")
+
+    # 전체 DOM을 만들지 않고 <list> 단위로 스트리밍 파싱
     codes: dict[str, dict] = {}
-    for item in root.iter("list"):
+    for _, item in etree.iterparse(str(cache_file), events=("end",), tag="list"):
         name = (item.findtext("corp_name") or "").strip()
         corp_code = (item.findtext("corp_code") or "").strip()
         stock_code = (item.findtext("stock_code") or "").strip()
@@ -46,6 +204,13 @@ def _load_corp_codes() -> dict[str, dict]:
                 "stock_code": stock_code,
                 "corp_name": name,
             }
+        # 처리한 요소와 앞선 형제 요소를 해제해 메모리를 일정하게 유지
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+    with pickle_file.open("wb") as f:
+        pickle.dump(codes, f, protocol=5)
 
     _corp_code_cache = codes
     print(f"[DART] 기업코드 {len(codes):,}개 로드 완료")
@@ -55,18 +220,40 @@ def _load_corp_codes() -> dict[str, dict]:
 def _download_corp_codes(dest: Path) -> None:
     """DART에서 기업코드 ZIP을 받아서 XML로 저장."""
     dest.parent.mkdir(parents=True, exist_ok=True)
-    resp = httpx.get(
-        f"{DART_BASE_URL}/corpCode.xml",
-        params={"crtfc_key": DART_API_KEY},
-        timeout=30,
-    )
-    resp.raise_for_status()
-    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
-        xml_name = zf.namelist()[0]
-        dest.write_bytes(zf.read(xml_name))
+    # ZIP은 임시 파일로 스트리밍하고, XML도 조각 단위로 풀어 써서 메모리에 전체를 올리지 않는다
+    with tempfile.TemporaryFile() as tmp:
+        with _CLIENT.stream("GET", "/corpCode.xml", timeout=30) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_bytes(1 << 16):
+                tmp.write(chunk)
+        tmp.seek(0)
+        with zipfile.ZipFile(tmp) as zf:
+            xml_name = zf.namelist()[0]
+            # 임시 파일에 다 쓴 뒤 교체해, 갱신 도중 실패해도 기존 마스터가 깨지지 않게 한다
+            part = dest.with_suffix(".xml.part")
+            with zf.open(xml_name) as src, part.open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 16)
+            os.replace(part, dest)
     print(f"[DART] 기업코드 저장: {dest}")
 
 
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _get_gram_index() -> dict[str, list[str]]:
+    """부분 일치 검색용 2-gram 색인. 정확히 일치하면 쓰지 않으므로 처음 필요할 때 만든다."""
+    global _corp_gram_index
+    if _corp_gram_index is None:
+        index: dict[str, list[str]] = {}
+        for name in _load_corp_codes():
+            for gram in _bigrams(name):
+                index.setdefault(gram, []).append(name)
+        _corp_gram_index = index
+    return _corp_gram_index
+
+
+@functools.lru_cache(maxsize=1024)
 def search_corp_code(company_name: str) -> dict | None:
     """회사명으로 DART 기업코드를 검색한다.
 
@@ -78,8 +265,16 @@ def search_corp_code(company_name: str) -> dict | None:
     if company_name in codes:
         return codes[company_name]
 
-    # 부분 일치
-    matches = [v for k, v in codes.items() if company_name in k]
+    # 부분 일치 — 검색어의 2-gram을 모두 가진 회사명만 후보로 좁힌 뒤 확인
+    grams = _bigrams(company_name)
+    if grams:
+        index = _get_gram_index()
+        postings = sorted((index.get(g, []) for g in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        names = [n for n in postings[0] if n in candidates and company_name in n]
+    else:
+        names = [k for k in codes if company_name in k]
+    matches = [codes[n] for n in names]
     if len(matches) == 1:
         return matches[0]
     if len(matches) > 1:
@@ -96,6 +291,7 @@ def search_corp_code(company_name: str) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
+@disk_cache("filings")
 def search_filings(
     corp_code: str,
     pblntf_detail_ty: str = "C001",  # 증권신고서(지분증권)
@@ -104,8 +300,33 @@ def search_filings(
     last_reprt_at: str = "Y",
 ) -> list[dict]:
     """DART 공시검색 — 증권신고서 등 특정 유형 공시를 검색한다."""
-    params = {
-        "crtfc_key": DART_API_KEY,
+    params = _filings_params(corp_code, pblntf_detail_ty, bgn_de, end_de, last_reprt_at)
+    resp = _CLIENT.get("/list.json", params=params)
+    return _filings_from_response(orjson.loads(resp.content))
+
+
+@disk_cache("filings")
+async def asearch_filings(
+    corp_code: str,
+    pblntf_detail_ty: str = "C001",
+    bgn_de: str = "20150101",
+    end_de: str = "20261231",
+    last_reprt_at: str = "Y",
+) -> list[dict]:
+    """search_filings의 비동기 버전."""
+    params = _filings_params(corp_code, pblntf_detail_ty, bgn_de, end_de, last_reprt_at)
+    resp = await _aget("/list.json", params=params)
+    return _filings_from_response(orjson.loads(resp.content))
+
+
+def _filings_params(
+    corp_code: str,
+    pblntf_detail_ty: str,
+    bgn_de: str,
+    end_de: str,
+    last_reprt_at: str,
+) -> dict:
+    return {
         "corp_code": corp_code,
         "bgn_de": bgn_de,
         "end_de": end_de,
@@ -114,9 +335,9 @@ def search_filings(
         "last_reprt_at": last_reprt_at,
         "page_count": "100",
     }
-    resp = httpx.get(f"{DART_BASE_URL}/list.json", params=params, timeout=15)
-    data = resp.json()
 
+
+def _filings_from_response(data: dict) -> list[dict]:
     if data.get("status") != "000":
         print(f"[DART] 공시검색 실패: {data.get('message')}")
         return []
@@ -131,14 +352,21 @@ def search_filings(
 # ---------------------------------------------------------------------------
 
 
+@disk_cache("company_info")
 def get_company_info(corp_code: str) -> dict | None:
     """DART 기업개황 API."""
-    resp = httpx.get(
-        f"{DART_BASE_URL}/company.json",
-        params={"crtfc_key": DART_API_KEY, "corp_code": corp_code},
-        timeout=15,
-    )
-    data = resp.json()
+    resp = _CLIENT.get("/company.json", params={"corp_code": corp_code})
+    return _company_from_response(orjson.loads(resp.content))
+
+
+@disk_cache("company_info")
+async def aget_company_info(corp_code: str) -> dict | None:
+    """get_company_info의 비동기 버전."""
+    resp = await _aget("/company.json", params={"corp_code": corp_code})
+    return _company_from_response(orjson.loads(resp.content))
+
+
+def _company_from_response(data: dict) -> dict | None:
     if data.get("status") != "000":
         print(f"[DART] 기업개황 실패: {data.get('message')}")
         return None
@@ -150,23 +378,35 @@ def get_company_info(corp_code: str) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
+@disk_cache("equity")
 def get_equity_registration(
     corp_code: str,
     bgn_de: str = "20150101",
     end_de: str = "20261231",
 ) -> dict | None:
     """증권신고서(지분증권) 주요정보 — 공모개요, 공모가, 주관사, 자금용도."""
-    resp = httpx.get(
-        f"{DART_BASE_URL}/estkRs.json",
-        params={
-            "crtfc_key": DART_API_KEY,
-            "corp_code": corp_code,
-            "bgn_de": bgn_de,
-            "end_de": end_de,
-        },
-        timeout=15,
+    resp = _CLIENT.get(
+        "/estkRs.json",
+        params={"corp_code": corp_code, "bgn_de": bgn_de, "end_de": end_de},
     )
-    data = resp.json()
+    return _equity_from_response(orjson.loads(resp.content))
+
+
+@disk_cache("equity")
+async def aget_equity_registration(
+    corp_code: str,
+    bgn_de: str = "20150101",
+    end_de: str = "20261231",
+) -> dict | None:
+    """get_equity_registration의 비동기 버전."""
+    resp = await _aget(
+        "/estkRs.json",
+        params={"corp_code": corp_code, "bgn_de": bgn_de, "end_de": end_de},
+    )
+    return _equity_from_response(orjson.loads(resp.content))
+
+
+def _equity_from_response(data: dict) -> dict | None:
     if data.get("status") != "000":
         print(f"[DART] 지분증권 API 실패: {data.get('message')}")
         return None
@@ -202,59 +442,151 @@ def get_equity_registration(
 # ---------------------------------------------------------------------------
 
 
+def _financials_params(corp_code: str, bsns_year: str, reprt_code: str) -> dict:
+    return {"corp_code": corp_code, "bsns_year": bsns_year, "reprt_code": reprt_code}
+
+
+def _financials_items(data: dict) -> list[dict]:
+    if data.get("status") != "000":
+        # 미상장 기업은 사업보고서가 없을 수 있음
+        return []
+    return data.get("list", [])
+
+
+def _default_years(count: int = 4) -> list[str]:
+    """직전 완료 회계연도부터 거슬러 올라간 count개 연도 (오래된 순)."""
+    this_year = date.today().year
+    return [str(y) for y in range(this_year - count, this_year)]
+
+
+# 연간 보고서가 없을 때 시도할 보고서 코드 (우선순위 순)
+_FALLBACK_REPRT_CODES = [("11012", "반기"), ("11014", "3분기"), ("11013", "1분기")]
+
+
 def get_financials(
     corp_code: str,
     bsns_year: str,
     reprt_code: str = "11011",  # 사업보고서 (연간)
 ) -> list[dict]:
     """단일회사 주요계정 재무제표."""
-    resp = httpx.get(
-        f"{DART_BASE_URL}/fnlttSinglAcnt.json",
-        params={
-            "crtfc_key": DART_API_KEY,
-            "corp_code": corp_code,
-            "bsns_year": bsns_year,
-            "reprt_code": reprt_code,
-        },
-        timeout=15,
-    )
-    data = resp.json()
-    if data.get("status") != "000":
-        # 미상장 기업은 사업보고서가 없을 수 있음
-        return []
-    return data.get("list", [])
+    resp = _CLIENT.get("/fnlttSinglAcnt.json", params=_financials_params(corp_code, bsns_year, reprt_code))
+    return _financials_items(orjson.loads(resp.content))
 
 
+@disk_cache("financials")
 def get_financials_multi_year(
     corp_code: str,
     years: list[str] | None = None,
 ) -> dict[str, list[dict]]:
-    """여러 연도의 재무제표를 한번에 가져온다."""
+    """여러 연도의 재무제표를 한번에 가져온다.
+
+    연도별 요청을 스레드 풀로 동시에 보내고, 사업보고서가 없는 연도는
+    반기/분기 보고서 요청도 한꺼번에 보낸 뒤 우선순위대로 고른다.
+    """
     if years is None:
-        years = ["2022", "2023", "2024"]
+        years = _default_years()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        annual = list(executor.map(lambda y: get_financials(corp_code, y), years))
+
+        # 반기/분기 시도 — 비어 있는 연도 × 보고서 코드 조합을 동시에 요청
+        missing = [y for y, items in zip(years, annual) if not items]
+        combos = [(y, code, label) for y in missing for code, label in _FALLBACK_REPRT_CODES]
+        fallback = list(executor.map(lambda c: get_financials(corp_code, c[0], c[1]), combos))
 
     result = {}
-    for year in years:
-        items = get_financials(corp_code, year)
+    for year, items in zip(years, annual):
         if items:
             result[year] = items
             print(f"[DART] {year}년 재무제표 {len(items)}개 항목")
-        else:
-            # 반기/분기 시도
-            for code, label in [("11012", "반기"), ("11014", "3분기"), ("11013", "1분기")]:
-                items = get_financials(corp_code, year, code)
-                if items:
-                    result[year] = items
-                    print(f"[DART] {year}년 {label} 재무제표 {len(items)}개 항목")
-                    break
+    for (year, _, label), items in zip(combos, fallback):
+        if items and year not in result:
+            result[year] = items
+            print(f"[DART] {year}년 {label} 재무제표 {len(items)}개 항목")
+    return {y: result[y] for y in years if y in result}
+
+
+async def _aget_financials(
+    corp_code: str,
+    bsns_year: str,
+    reprt_code: str = "11011",
+) -> list[dict]:
+    """get_financials의 비동기 버전."""
+    resp = await _aget(
+        "/fnlttSinglAcnt.json",
+        params=_financials_params(corp_code, bsns_year, reprt_code),
+    )
+    return _financials_items(orjson.loads(resp.content))
+
+
+async def _aget_financials_with_fallback(corp_code: str, year: str) -> tuple[list[dict], str]:
+    items = await _aget_financials(corp_code, year)
+    if items:
+        return items, ""
+    for code, label in _FALLBACK_REPRT_CODES:
+        items = await _aget_financials(corp_code, year, code)
+        if items:
+            return items, label
+    return [], ""
+
+
+@disk_cache("financials")
+async def aget_financials_multi_year(
+    corp_code: str,
+    years: list[str] | None = None,
+) -> dict[str, list[dict]]:
+    """get_financials_multi_year의 비동기 버전 — 연도별 요청을 동시에 보낸다."""
+    if years is None:
+        years = _default_years()
+
+    fetched = await asyncio.gather(
+        *[_aget_financials_with_fallback(corp_code, y) for y in years]
+    )
+
+    result = {}
+    for year, (items, label) in zip(years, fetched):
+        if items:
+            result[year] = items
+            prefix = f"{label} " if label else ""
+            print(f"[DART] {year}년 {prefix}재무제표 {len(items)}개 항목")
     return result
 
 
+# ---------------------------------------------------------------------------
+# 일괄 수집 (비동기)
+# ---------------------------------------------------------------------------
+
+
+async def collect_all(
+    corp_code: str,
+    last_reprt_at: str = "N",
+) -> tuple[dict | None, list[dict], dict | None, dict[str, list[dict]]]:
+    """기업개황·공시검색·지분증권·재무제표를 동시에 요청한다.
+
+    서로 의존성이 없는 호출이므로 한 번에 보내고 모두 끝나기를 기다린다.
+    공시검색은 파이프라인과 같이 기본으로 정정본을 포함한다 (last_reprt_at="N").
+
+    Returns:
+        (기업개황, 공시 목록, 지분증권 데이터, 연도별 재무제표)
+    """
+    company, filings, equity, fins = await asyncio.gather(
+        aget_company_info(corp_code),
+        asearch_filings(corp_code, last_reprt_at=last_reprt_at),
+        aget_equity_registration(corp_code),
+        aget_financials_multi_year(corp_code),
+    )
+    return company, filings, equity, fins
+
+
 # ---------------------------------------------------------------------------
 # 증권신고서 원본 문서 다운로드
 # ---------------------------------------------------------------------------
 
 
+# 이 크기까지는 다운로드한 ZIP을 메모리에 둔다
+_SPOOL_MAX_BYTES = 50 * 1024 * 1024
+
+
 def download_document(rcept_no: str, save_dir: Path | None = None) -> Path | None:
     """증권신고서 원본 ZIP을 다운로드하고 압축을 풀어 반환한다."""
     from config.settings import FILINGS_DIR
@@ -269,21 +601,27 @@ def download_document(rcept_no: str, save_dir: Path | None = None) -> Path | Non
         print(f"[DART] 이미 다운로드됨: {save_dir}")
         return save_dir
 
-    resp = httpx.get(
-        f"{DART_BASE_URL}/document.xml",
-        params={"crtfc_key": DART_API_KEY, "rcept_no": rcept_no},
-        timeout=60,
-    )
-
-    if resp.status_code != 200 or len(resp.content) < 1000:
-        print(f"[DART] 문서 다운로드 실패: {rcept_no}")
-        return None
-
-    try:
-        with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
-            zf.extractall(save_dir)
-        print(f"[DART] 문서 저장: {save_dir} ({len(list(save_dir.iterdir()))}개 파일)")
-        return save_dir
-    except zipfile.BadZipFile:
-        print(f"[DART] ZIP 파일 아님: {rcept_no}")
-        return None
+    # 응답을 청크 단위로 받아 SpooledTemporaryFile에 쓴다
+    # (보통 크기의 ZIP은 메모리에서 바로 풀고, 큰 파일만 디스크로 넘어간다)
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as buf:
+        with _CLIENT.stream("GET", "/document.xml", params={"rcept_no": rcept_no}, timeout=60) as resp:
+            if resp.status_code != 200:
+                print(f"[DART] 문서 다운로드 실패: {rcept_no}")
+                return None
+            for chunk in resp.iter_bytes(65536):
+                buf.write(chunk)
+
+        if buf.tell() < 1000:
+            print(f"[DART] 문서 다운로드 실패: {rcept_no}")
+            return None
+
+        buf.seek(0)
+        try:
+            with zipfile.ZipFile(buf) as zf:
+                zf.extractall(save_dir)
+        except zipfile.BadZipFile:
+            print(f"[DART] ZIP 파일 아님: {rcept_no}")
+            return None
+
+    print(f"[DART] 문서 저장: {save_dir} ({len(list(save_dir.iterdir()))}개 파일)")
+    return save_dir
@@ -20,6 +20,10 @@ DATA_DIR = BASE_DIR / "data"
 CORP_CODES_DIR = DATA_DIR / "corp_codes"
 FILINGS_DIR = DATA_DIR / "filings"
 REPORTS_DIR = DATA_DIR / "reports"
+CACHE_DIR = DATA_DIR / "cache"
 
 # LLM 설정
 LLM_MODEL = "claude-sonnet-4-20250514"
+# 증권신고서 파싱: 표 옮겨 적기는 빠른 모델, 요약·판단이 필요한 작업은 기본 모델
+LLM_MODEL_SMART = LLM_MODEL
+LLM_MODEL_FAST = "claude-haiku-4-5-20251001"
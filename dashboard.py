@@ -5,15 +5,23 @@
     streamlit run dashboard.py --server.port 8503
 """
 
+import functools
 import json
 import os
 import re
 import sys
+from collections import defaultdict, deque
 from pathlib import Path
 
-import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경 → 표준 json.load
+    orjson = None
+
 sys.path.insert(0, str(Path(__file__).parent))
 
 # ──────────────────────────────────────────────��──────────
@@ -405,42 +413,117 @@ COLORS = {
     "grid": "#2a2d34",
 }
 
+# 차트에서 반복 조회하는 색상은 모듈 상수로 바인딩
+_PRIMARY = COLORS["primary"]
+_SECONDARY = COLORS["secondary"]
+_TERTIARY = COLORS["tertiary"]
+_ACCENT = COLORS["accent"]
+_POSITIVE = COLORS["positive"]
+_NEGATIVE = COLORS["negative"]
+_NEGATIVE_LIGHT = COLORS["negative_light"]
+_NEUTRAL = COLORS["neutral"]
+_GRID = COLORS["grid"]
+
 PLOTLY_LAYOUT = dict(
     plot_bgcolor="rgba(0,0,0,0)",
     paper_bgcolor="rgba(0,0,0,0)",
     font=dict(color="#e5e7eb", size=12),
-    xaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"]),
-    yaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"]),
+    xaxis=dict(gridcolor=_GRID, zerolinecolor=_GRID),
+    yaxis=dict(gridcolor=_GRID, zerolinecolor=_GRID),
     margin=dict(l=40, r=20, t=40, b=30),
 )
 
 
+def _go():
+    """plotly는 차트를 그릴 때 처음 import (AI 리포트만 보는 세션의 콜드 스타트 단축)."""
+    import plotly.graph_objects as go
+    return go
+
+
+def _read_json(path):
+    """JSON 파일을 바이너리로 열어 파싱 (텍스트 디코딩한 str 사본을 따로 만들지 않음)."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if orjson else json.load(f)
+
+
 @st.cache_data
 def load_data(filepath: str) -> dict:
-    return json.loads(Path(filepath).read_text(encoding="utf-8"))
+    return _read_json(filepath)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def find_data_files() -> list[tuple[str, str]]:
+    """(종목 라벨, 최신 데이터 파일 경로) 목록. 매 rerun마다 디렉토리를 다시 읽지 않도록 캐시한다."""
+    files: list[tuple[str, str]] = []
+    if not REPORTS_DIR.exists():
+        return files
+
+    # glob 대신 scandir + 접미사 비교 (항목마다 Path를 만들지 않음)
+    with os.scandir(REPORTS_DIR) as it:
+        names = [e.name for e in it if e.name.endswith("_data.json") and e.is_file()]
+    names.sort(reverse=True)
+
+    seen = set()
+
+    for name in names:
+        stem = name[:-len(".json")]
+        parts = stem.replace("_data", "").split("_", 1)
+        label = parts[1] if len(parts) == 2 else stem
+        # 같은 종목이면 최신 파일(먼저 등장)만 유지
+        if label not in seen:
+            seen.add(label)
+            files.append((label, os.path.join(REPORTS_DIR, name)))
+    return files
 
 
-def find_data_files() -> dict[str, Path]:
-    files = {}
-    if REPORTS_DIR.exists():
-        for f in sorted(REPORTS_DIR.glob("*_data.json"), reverse=True):
-            parts = f.stem.replace("_data", "").split("_", 1)
-            if len(parts) == 2:
-                label = parts[1]
-            else:
-                label = f.stem
-            # 같은 종목이면 최신 파일(먼저 등장)만 유지
-            if label not in files:
-                files[label] = f
-    return files
+@st.cache_data(ttl=60, show_spinner=False)
+def _find_report_md(display_name: str, clean_name: str) -> str | None:
+    """종목의 최신 AI 리포트(.md) 경로. 표시명 → 정제된 회사명 순으로 찾는다."""
+    for name in (display_name, clean_name):
+        md_files = sorted(REPORTS_DIR.glob(f"*_{name}_리서치.md"), reverse=True)
+        if md_files:
+            return str(md_files[0])
+    return None
+
+
+@st.cache_data(show_spinner=False)
+def _read_report_md(path: str, mtime: float) -> str:
+    """mtime을 캐시 키에 포함 — 리포트가 다시 생성되면 자동으로 새로 읽는다."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def load_report_md(display_name: str, clean_name: str) -> str:
+    """종목의 최신 AI 리포트 본문. 없으면 ""."""
+    path = _find_report_md(display_name, clean_name)
+    if not path:
+        return ""
+    try:
+        return _read_report_md(path, os.stat(path).st_mtime)
+    except FileNotFoundError:
+        return ""
+
+
+_CORP_MARK_RE = re.compile(r"\(주\)|주식회사 |㈜")
 
 
 def _clean_company_name(name: str) -> str:
-    for prefix in ["(주)", "주식회사 ", "㈜"]:
-        name = name.replace(prefix, "")
-    return name.strip()
+    return _CORP_MARK_RE.sub("", name).strip()
 
 
+def _memoize(fn):
+    """순수 포맷터용 LRU 캐시. 해시 불가능한 값(list/dict)이 들어오면 캐시 없이 호출."""
+    cached = functools.lru_cache(maxsize=1024, typed=True)(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except TypeError:
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@_memoize
 def fmt_억(val) -> str:
     if val is None:
         return "-"
@@ -450,6 +533,7 @@ def fmt_억(val) -> str:
         return str(val)
 
 
+@_memoize
 def fmt_조(val) -> str:
     if val is None:
         return "-"
@@ -459,6 +543,7 @@ def fmt_조(val) -> str:
         return str(val)
 
 
+@_memoize
 def fmt_pct(val) -> str:
     if val is None:
         return "-"
@@ -468,6 +553,7 @@ def fmt_pct(val) -> str:
         return str(val)
 
 
+@_memoize
 def fmt_원(val) -> str:
     if val is None:
         return "-"
@@ -477,6 +563,7 @@ def fmt_원(val) -> str:
         return str(val)
 
 
+@_memoize
 def safe_num(val, default=0):
     if val is None:
         return default
@@ -486,6 +573,23 @@ def safe_num(val, default=0):
         return default
 
 
+def _render_kv_markdown(items: dict) -> None:
+    """값이 있는 항목만 "**키**: 값" 문단으로 묶어 한 번의 st.markdown으로 출력."""
+    lines = [f"**{k}**: {v}" for k, v in items.items() if v and v != "-"]
+    if lines:
+        st.markdown("\n\n".join(lines))
+
+
+def _to_int(val) -> int | None:
+    """"12,000" / 12000 / "-" 같은 값을 정수로. 비어 있거나 숫자가 아니면 None."""
+    if val is None or val == "" or val == "-":
+        return None
+    try:
+        return int(val.replace(",", "").strip()) if isinstance(val, str) else int(val)
+    except (ValueError, TypeError):
+        return None
+
+
 def fmt_margin(revenue, income) -> str:
     rev = safe_num(revenue)
     inc = safe_num(income)
@@ -494,6 +598,39 @@ def fmt_margin(revenue, income) -> str:
     return f"{inc / rev * 100:.1f}%"
 
 
+def _records_frame(rows: list[dict], columns: list[str]) -> pd.DataFrame:
+    """dict 목록을 지정 컬럼의 DataFrame으로 한 번에 변환 (결측은 None — fmt_* 가 "-"로 표시)."""
+    df = pd.DataFrame(rows, columns=columns, dtype=object)
+    return df.where(df.notna(), None)
+
+
+def _num_array(values, div=1.0) -> np.ndarray:
+    """safe_num 규칙(None/비숫자 → 0)으로 float 배열을 만들고 div로 나눈다."""
+    return np.fromiter((safe_num(v) for v in values), dtype=np.float64) / div
+
+
+def _scale_and_label(values, div=1e8, unit="억"):
+    """값 목록을 한 번 순회하며 (스케일된 숫자, 표시 라벨)을 함께 만든다.
+
+    safe_num(v) / div 와 fmt_억(v)를 각각 돌리던 것과 같은 결과.
+    """
+    scaled, labels = [], []
+    for v in values:
+        if v is None:
+            scaled.append(0.0)
+            labels.append("-")
+            continue
+        try:
+            f = float(v) / div
+        except (ValueError, TypeError):
+            scaled.append(0.0)
+            labels.append(str(v))
+            continue
+        scaled.append(f)
+        labels.append(f"{f:,.0f}{unit}")
+    return scaled, labels
+
+
 # ─────────────────────────────────────────────────────────
 # 분석 실행 (프로그레스 표시)
 # ─────────────────────────────────────────────────────────
@@ -515,7 +652,7 @@ def run_analysis_with_progress(company_name: str):
     status_text = st.empty()
     log_expander = st.expander("실행 로그 보기", expanded=False)
     log_area = log_expander.empty()
-    log_lines = []
+    log_lines = deque(maxlen=30)  # 화면에 보이는 최근 로그만 유지 (메모리 고정)
 
     env = {**os.environ, "PYTHONUNBUFFERED": "1"}
     proc = subprocess.Popen(
@@ -535,7 +672,7 @@ def run_analysis_with_progress(company_name: str):
             if not line:
                 continue
             log_lines.append(line)
-            log_area.code("\n".join(log_lines[-30:]), language=None)
+            log_area.code("\n".join(log_lines), language=None)
 
             # 파이프라인 스텝 감지
             for i, (marker, desc) in enumerate(_PIPELINE_STEPS):
@@ -564,7 +701,8 @@ def run_analysis_with_progress(company_name: str):
     else:
         progress_bar.empty()
         status_text.empty()
-        st.error(f"분석 실패:\n{''.join(log_lines[-10:])}")
+        tail = "\n".join(list(log_lines)[-10:])
+        st.error(f"분석 실패:\n{tail}")
         return False
 
 
@@ -804,15 +942,19 @@ def _render_reasons_html(verdict: dict) -> str:
 
 # ─────────────────────────────────────────────────────────
 # 차트 빌더
+# 입력값이 같으면 rerun(탭 전환·위젯 조작) 시 Figure를 다시 만들지 않도록 캐시
 # ─────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
 def build_revenue_chart(years, revenues):
+    go = _go()
+    rev_억, rev_labels = _scale_and_label(revenues)
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=years,
-        y=[safe_num(r) / 1e8 for r in revenues],
+        y=rev_억,
         name="매출액",
-        marker_color=COLORS["primary"],
-        text=[fmt_억(r) for r in revenues],
+        marker_color=_PRIMARY,
+        text=rev_labels,
         textposition="outside",
         textfont=dict(color="#e5e7eb"),
     ))
@@ -820,23 +962,27 @@ def build_revenue_chart(years, revenues):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_profit_chart(years, op_incomes, net_incomes):
+    go = _go()
+    op_억, op_labels = _scale_and_label(op_incomes)
+    net_억, net_labels = _scale_and_label(net_incomes)
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=years,
-        y=[safe_num(o) / 1e8 for o in op_incomes],
+        y=op_억,
         name="영업이익",
-        marker_color=[COLORS["secondary"] if safe_num(o) >= 0 else COLORS["negative"] for o in op_incomes],
-        text=[fmt_억(o) for o in op_incomes],
+        marker_color=[_SECONDARY if v >= 0 else _NEGATIVE for v in op_억],
+        text=op_labels,
         textposition="outside",
         textfont=dict(color="#e5e7eb"),
     ))
     fig.add_trace(go.Bar(
         x=years,
-        y=[safe_num(n) / 1e8 for n in net_incomes],
+        y=net_억,
         name="순이익",
-        marker_color=[COLORS["tertiary"] if safe_num(n) >= 0 else COLORS["negative_light"] for n in net_incomes],
-        text=[fmt_억(n) for n in net_incomes],
+        marker_color=[_TERTIARY if v >= 0 else _NEGATIVE_LIGHT for v in net_억],
+        text=net_labels,
         textposition="outside",
         textfont=dict(color="#e5e7eb"),
     ))
@@ -844,10 +990,12 @@ def build_profit_chart(years, op_incomes, net_incomes):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_peer_per_chart(company_name, target_per, peers, avg_per):
+    go = _go()
     names = [company_name] + [p.get("name", "") for p in peers]
     pers = [safe_num(target_per)] + [safe_num(p.get("per")) for p in peers]
-    colors = [COLORS["accent"]] + [COLORS["primary"]] * len(peers)
+    colors = [_ACCENT] + [_PRIMARY] * len(peers)
 
     fig = go.Figure(go.Bar(
         x=names, y=pers,
@@ -858,20 +1006,21 @@ def build_peer_per_chart(company_name, target_per, peers, avg_per):
     ))
     if avg_per:
         fig.add_hline(
-            y=float(avg_per), line_dash="dash", line_color=COLORS["accent"],
+            y=float(avg_per), line_dash="dash", line_color=_ACCENT,
             annotation_text=f"Peer 평균 {avg_per}x",
             annotation_position="top right",
-            annotation_font_color=COLORS["accent"],
+            annotation_font_color=_ACCENT,
         )
     fig.update_layout(title="PER 비교", height=380, showlegend=False, **PLOTLY_LAYOUT)
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_peer_revenue_chart(company_name, company_revenue, peers):
+    go = _go()
     names = [company_name] + [p.get("name", "") for p in peers]
-    revenues = [safe_num(company_revenue)] + [safe_num(p.get("revenue", 0)) for p in peers]
-    revenues_억 = [r / 1e8 for r in revenues]
-    colors = [COLORS["accent"]] + [COLORS["primary"]] * len(peers)
+    revenues_억 = _num_array([company_revenue] + [p.get("revenue", 0) for p in peers], 1e8)
+    colors = [_ACCENT] + [_PRIMARY] * len(peers)
 
     fig = go.Figure(go.Bar(
         y=names, x=revenues_억,
@@ -882,8 +1031,9 @@ def build_peer_revenue_chart(company_name, company_revenue, peers):
         textfont=dict(color="#e5e7eb"),
     ))
     # 로그 스케일 (최대/최소 비율 100배 이상이면)
-    max_r = max(revenues_억) if revenues_억 else 1
-    min_r = min(r for r in revenues_억 if r > 0) if any(r > 0 for r in revenues_억) else 1
+    positive = revenues_억[revenues_억 > 0]
+    max_r = revenues_억.max()
+    min_r = positive.min() if positive.size else 1
     if max_r / min_r > 100:
         fig.update_layout(xaxis_type="log")
 
@@ -896,7 +1046,9 @@ def build_peer_revenue_chart(company_name, company_revenue, peers):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_peer_margin_chart(company_name, company_financials, peers):
+    go = _go()
     latest = company_financials[-1] if company_financials else {}
     rev = safe_num(latest.get("revenue", 0))
     op = safe_num(latest.get("operating_income", 0))
@@ -912,7 +1064,7 @@ def build_peer_margin_chart(company_name, company_financials, peers):
         names.append(p.get("name", ""))
         margins.append(margin)
 
-    colors = [COLORS["positive"] if m >= 0 else COLORS["negative"] for m in margins]
+    colors = [_POSITIVE if m >= 0 else _NEGATIVE for m in margins]
 
     fig = go.Figure(go.Bar(
         x=names, y=margins,
@@ -930,16 +1082,13 @@ def build_peer_margin_chart(company_name, company_financials, peers):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_valuation_waterfall(valuation, confirmed_price_str):
     """공모가 산출 과정 워터폴 차트 — 할인율을 시각적으로 표시"""
+    go = _go()
     per_share = safe_num(valuation.get("per_share_value"))
 
-    confirmed = 0
-    if confirmed_price_str and confirmed_price_str != "-":
-        try:
-            confirmed = int(str(confirmed_price_str).replace(",", ""))
-        except (ValueError, TypeError):
-            confirmed = 0
+    confirmed = _to_int(confirmed_price_str) or 0
 
     if per_share == 0:
         return None
@@ -971,11 +1120,11 @@ def build_valuation_waterfall(valuation, confirmed_price_str):
     colors = []
     for i, v in enumerate(values):
         if i == 0:
-            colors.append(COLORS["neutral"])
+            colors.append(_NEUTRAL)
         elif v == confirmed:
-            colors.append(COLORS["accent"])
+            colors.append(_ACCENT)
         else:
-            colors.append(COLORS["primary"])
+            colors.append(_PRIMARY)
 
     text_labels = [f"{fmt_원(v)}<br><span style='font-size:0.7em;color:#9ca3af'>{a}</span>"
                    for v, a in zip(values, annotations)]
@@ -994,7 +1143,9 @@ def build_valuation_waterfall(valuation, confirmed_price_str):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_lockup_pie(lockup_data):
+    go = _go()
     first = lockup_data[0]
     listing_ratio = safe_num(first.get("ratio", 0))
     lockup_ratio = max(0, 1 - listing_ratio)
@@ -1002,7 +1153,7 @@ def build_lockup_pie(lockup_data):
     fig = go.Figure(data=[go.Pie(
         labels=["상장일 유통", "보호예수"],
         values=[listing_ratio, lockup_ratio],
-        marker_colors=[COLORS["accent"], COLORS["primary"]],
+        marker_colors=[_ACCENT, _PRIMARY],
         textinfo="label+percent",
         hole=0.45,
         textfont=dict(color="#e5e7eb"),
@@ -1011,27 +1162,29 @@ def build_lockup_pie(lockup_data):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_lockup_timeline(lockup_data):
+    go = _go()
     periods = [item.get("period", "") for item in lockup_data]
-    cum_ratios = [min(safe_num(item.get("cumulative_ratio", 0)) * 100, 100) for item in lockup_data]
-    shares_list = [safe_num(item.get("shares", 0)) for item in lockup_data]
+    cum_ratios = np.minimum(_num_array(item.get("cumulative_ratio", 0) for item in lockup_data) * 100, 100)
+    shares_만 = _num_array((item.get("shares", 0) for item in lockup_data), 10000)
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=periods, y=[s / 10000 for s in shares_list],
-        name="유통 주식수", marker_color=COLORS["primary"], yaxis="y",
+        x=periods, y=shares_만,
+        name="유통 주식수", marker_color=_PRIMARY, yaxis="y",
     ))
     fig.add_trace(go.Scatter(
         x=periods, y=cum_ratios, name="누적 비율",
         mode="lines+markers+text",
         text=[f"{r:.1f}%" for r in cum_ratios], textposition="top center",
-        line=dict(color=COLORS["accent"], width=3),
+        line=dict(color=_ACCENT, width=3),
         marker=dict(size=8), yaxis="y2",
-        textfont=dict(color=COLORS["accent"]),
+        textfont=dict(color=_ACCENT),
     ))
     layout = {**PLOTLY_LAYOUT}
-    layout["yaxis"] = dict(title="만주", side="left", gridcolor=COLORS["grid"])
-    layout["yaxis2"] = dict(title="%", side="right", overlaying="y", range=[0, 110], gridcolor=COLORS["grid"])
+    layout["yaxis"] = dict(title="만주", side="left", gridcolor=_GRID)
+    layout["yaxis2"] = dict(title="%", side="right", overlaying="y", range=[0, 110], gridcolor=_GRID)
     fig.update_layout(
         title="유통가능주식 & 누적비율", height=360,
         legend=dict(orientation="h", yanchor="bottom", y=1.02, font=dict(color="#e5e7eb")),
@@ -1040,16 +1193,18 @@ def build_lockup_timeline(lockup_data):
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_financial_mini_chart(financials):
+    go = _go()
     years = [str(f.get("year", "")) for f in financials]
-    revenues = [safe_num(f.get("revenue", 0)) / 1e8 for f in financials]
-    op_incomes = [safe_num(f.get("operating_income", 0)) / 1e8 for f in financials]
-    net_incomes = [safe_num(f.get("net_income", 0)) / 1e8 for f in financials]
+    revenues = _num_array((f.get("revenue", 0) for f in financials), 1e8)
+    op_incomes = _num_array((f.get("operating_income", 0) for f in financials), 1e8)
+    net_incomes = _num_array((f.get("net_income", 0) for f in financials), 1e8)
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=years, y=revenues, name="매출",
-        marker_color=COLORS["primary"],
+        marker_color=_PRIMARY,
         textfont=dict(size=9),
     ))
     fig.add_trace(go.Scatter(
@@ -1057,8 +1212,8 @@ def build_financial_mini_chart(financials):
         mode="lines+markers+text",
         text=[f"{v:,.0f}" for v in op_incomes],
         textposition="top center",
-        textfont=dict(color=COLORS["secondary"], size=9),
-        line=dict(color=COLORS["secondary"], width=2),
+        textfont=dict(color=_SECONDARY, size=9),
+        line=dict(color=_SECONDARY, width=2),
         marker=dict(size=6),
     ))
     fig.add_trace(go.Scatter(
@@ -1066,8 +1221,8 @@ def build_financial_mini_chart(financials):
         mode="lines+markers+text",
         text=[f"{v:,.0f}" for v in net_incomes],
         textposition="bottom center",
-        textfont=dict(color=COLORS["tertiary"], size=9),
-        line=dict(color=COLORS["tertiary"], width=2, dash="dot"),
+        textfont=dict(color=_TERTIARY, size=9),
+        line=dict(color=_TERTIARY, width=2, dash="dot"),
         marker=dict(size=6),
     ))
     fig.update_layout(
@@ -1082,17 +1237,19 @@ def build_financial_mini_chart(financials):
         paper_bgcolor="rgba(0,0,0,0)",
         font=dict(color="#e5e7eb", size=10),
         xaxis=dict(showgrid=False),
-        yaxis=dict(showgrid=False, gridcolor=COLORS["grid"]),
+        yaxis=dict(showgrid=False, gridcolor=_GRID),
     )
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def build_product_pie(products):
-    revenue_by_name: dict[str, float] = {}
+    go = _go()
+    revenue_by_name: defaultdict[str, float] = defaultdict(float)
     for p in products:
-        if p.get("revenue_share"):
-            name = p.get("name", "기타")
-            revenue_by_name[name] = revenue_by_name.get(name, 0) + float(p["revenue_share"])
+        share = p.get("revenue_share")
+        if share:
+            revenue_by_name[p.get("name", "기타")] += float(share)
     if not revenue_by_name:
         return None
     fig = go.Figure(data=[go.Pie(
@@ -1110,6 +1267,7 @@ def build_product_pie(products):
 # ─────────────────────────────────────────────────────────
 def render_calibration_view():
     """캘리브레이션 대시보드: AI 판단 vs 실제 시장 결과 비교."""
+    go = _go()
     st.markdown("## IPO 판단 검증 대시보드")
 
     if not CALIBRATION_FILE.exists():
@@ -1119,7 +1277,7 @@ def render_calibration_view():
         )
         return
 
-    ipos = json.loads(CALIBRATION_FILE.read_text(encoding="utf-8"))
+    ipos = _read_json(CALIBRATION_FILE)
     if not ipos:
         st.info("데이터가 비어있습니다.")
         return
@@ -1239,9 +1397,9 @@ def render_calibration_view():
     if by_verdict:
         st.markdown('<div class="section-header">AI 판단별 성과</div>', unsafe_allow_html=True)
         verdict_colors = {
-            "BUY": COLORS["positive"],
-            "CONDITIONAL": COLORS["accent"],
-            "AVOID": COLORS["negative"],
+            "BUY": _POSITIVE,
+            "CONDITIONAL": _ACCENT,
+            "AVOID": _NEGATIVE,
         }
         vnames = []
         vreturns = []
@@ -1252,7 +1410,7 @@ def render_calibration_view():
                 vnames.append(v)
                 vreturns.append(d["avg_return"])
                 vcounts.append(d["count"])
-                vcolors.append(verdict_colors.get(v, COLORS["neutral"]))
+                vcolors.append(verdict_colors.get(v, _NEUTRAL))
 
         if vnames:
             fig = go.Figure(go.Bar(
@@ -1319,8 +1477,8 @@ with st.sidebar:
             st.error("데이터 없음. `python main.py <종목명>`으로 분석을 먼저 실행하세요.")
             st.stop()
 
-        selected = st.selectbox("종목 선택", list(data_files.keys()))
-        data = load_data(str(data_files[selected]))
+        selected, selected_path = st.selectbox("종목 선택", data_files, format_func=lambda item: item[0])
+        data = load_data(selected_path)
 
         # 선택된 종목 재분석
         if selected:
@@ -1344,6 +1502,8 @@ if st.session_state.get("_run_analysis"):
     if run_analysis_with_progress(_target):
         import time
         time.sleep(1)
+        # 새로 생성된 파일이 목록·데이터에 바로 반영되도록 캐시 비움
+        st.cache_data.clear()
         st.rerun()
 
 # ─────────────────────────────────────────────────────────
@@ -1371,14 +1531,11 @@ company_name = _clean_company_name(company_info.get("corp_name", display_name))
 securities = offering.get("securities", [{}])
 sec = securities[0] if securities else {}
 confirmed_price = crawler.get("confirmed_price", "")
+confirmed_price_int = _to_int(confirmed_price)
 offering_price = sec.get("offering_price")
 
 # AI 리포트 로드
-md_files = sorted(REPORTS_DIR.glob(f"*_{display_name}_리서치.md"), reverse=True)
-if not md_files:
-    clean_name = _clean_company_name(company_info.get("corp_name", display_name))
-    md_files = sorted(REPORTS_DIR.glob(f"*_{clean_name}_리서치.md"), reverse=True)
-report_text = md_files[0].read_text(encoding="utf-8") if md_files else ""
+report_text = load_report_md(display_name, company_name)
 verdict = _parse_verdict(report_text)
 
 # 시그널 분류
@@ -1565,19 +1722,19 @@ with hero_right:
 # ═══════════════════════════════════════════════════════════
 # 상세 분석 탭 (전체 너비)
 # ═══════════════════════════════════════════════════════════
-tab_fin, tab_peer, tab_val, tab_supply, tab_biz, tab_report = st.tabs(
-    ["재무", "Peer 비교", "밸류에이션", "수급", "사업분석", "AI 리포트"]
-)
+# 탭마다 fragment로 분리 — 탭 안의 상호작용은 해당 탭만 다시 그린다.
+
 
 # ── 재무 탭 ──
-with tab_fin:
+@st.fragment
+def _render_fin_tab():
     if not financials:
         st.info("재무제표 데이터가 없습니다.")
     else:
-        years = [str(f.get("year", "")) for f in financials]
-        revenues = [f.get("revenue") for f in financials]
-        op_incomes = [f.get("operating_income") for f in financials]
-        net_incomes = [f.get("net_income") for f in financials]
+        years = tuple(str(f.get("year", "")) for f in financials)
+        revenues = tuple(f.get("revenue") for f in financials)
+        op_incomes = tuple(f.get("operating_income") for f in financials)
+        net_incomes = tuple(f.get("net_income") for f in financials)
 
         c1, c2 = st.columns(2)
         with c1:
@@ -1585,26 +1742,30 @@ with tab_fin:
         with c2:
             st.plotly_chart(build_profit_chart(years, op_incomes, net_incomes), key="profit", width="stretch")
 
-        table_rows = []
-        for f in financials:
-            table_rows.append({
-                "연도": f.get("year", ""),
-                "매출액": fmt_억(f.get("revenue")),
-                "영업이익": fmt_억(f.get("operating_income")),
-                "순이익": fmt_억(f.get("net_income")),
-                "자산": fmt_억(f.get("total_assets")),
-                "부채": fmt_억(f.get("total_liabilities")),
-                "자본": fmt_억(f.get("total_equity")),
-                "매출YoY": fmt_pct(f.get("revenue_yoy")) if f.get("revenue_yoy") is not None else "-",
-            })
-        st.dataframe(table_rows, width="stretch", hide_index=True)
+        fin_df = _records_frame(financials, [
+            "year", "revenue", "operating_income", "net_income",
+            "total_assets", "total_liabilities", "total_equity", "revenue_yoy",
+        ])
+        fin_table = pd.DataFrame({
+            "연도": fin_df["year"].fillna(""),
+            "매출액": fin_df["revenue"].map(fmt_억),
+            "영업이익": fin_df["operating_income"].map(fmt_억),
+            "순이익": fin_df["net_income"].map(fmt_억),
+            "자산": fin_df["total_assets"].map(fmt_억),
+            "부채": fin_df["total_liabilities"].map(fmt_억),
+            "자본": fin_df["total_equity"].map(fmt_억),
+            "매출YoY": fin_df["revenue_yoy"].map(fmt_pct),
+        })
+        st.dataframe(fin_table, width="stretch", hide_index=True)
 
         source = financials[0].get("source", "DART API") if financials else ""
         if source == "증권신고서":
             st.caption("* 출처: 증권신고서 (DART API 미제공)")
 
+
 # ── Peer 비교 탭 ──
-with tab_peer:
+@st.fragment
+def _render_peer_tab():
     if not peers:
         st.info("비교회사(Peer) 데이터가 없습니다.")
     else:
@@ -1668,31 +1829,38 @@ with tab_peer:
 
         # 종합 비교 테이블
         st.markdown('<div class="section-header">Peer Group 종합 비교</div>', unsafe_allow_html=True)
-        peer_table = []
-        # 공모기업 행
-        peer_table.append({
-            "회사": f"{company_name} (공모기업)",
-            "시장": company_info.get("corp_cls", "-"),
-            "매출액": fmt_억(latest_fin.get("revenue")),
-            "영업이익": fmt_억(latest_fin.get("operating_income")),
-            "영업이익률": fmt_margin(latest_fin.get("revenue"), latest_fin.get("operating_income")),
-            "시가총액": "-",
-            "PER": f"{target_per}x" if target_per else "-",
-        })
-        for p in peers:
-            peer_table.append({
-                "회사": p.get("name", ""),
-                "시장": p.get("market", ""),
-                "매출액": fmt_조(p.get("revenue")),
-                "영업이익": fmt_조(p.get("operating_income")),
-                "영업이익률": fmt_margin(p.get("revenue"), p.get("operating_income")),
-                "시가총액": fmt_조(p.get("market_cap")),
-                "PER": f"{p['per']:.1f}x" if p.get("per") else "-",
-            })
+        peer_df = _records_frame(peers, [
+            "name", "market", "revenue", "operating_income", "market_cap", "per",
+        ])
+        # 공모기업 행 + Peer 행
+        peer_table = pd.concat([
+            pd.DataFrame([{
+                "회사": f"{company_name} (공모기업)",
+                "시장": company_info.get("corp_cls", "-"),
+                "매출액": fmt_억(latest_fin.get("revenue")),
+                "영업이익": fmt_억(latest_fin.get("operating_income")),
+                "영업이익률": fmt_margin(latest_fin.get("revenue"), latest_fin.get("operating_income")),
+                "시가총액": "-",
+                "PER": f"{target_per}x" if target_per else "-",
+            }]),
+            pd.DataFrame({
+                "회사": peer_df["name"].fillna(""),
+                "시장": peer_df["market"].fillna(""),
+                "매출액": peer_df["revenue"].map(fmt_조),
+                "영업이익": peer_df["operating_income"].map(fmt_조),
+                "영업이익률": [
+                    fmt_margin(r, o) for r, o in zip(peer_df["revenue"], peer_df["operating_income"])
+                ],
+                "시가총액": peer_df["market_cap"].map(fmt_조),
+                "PER": peer_df["per"].map(lambda v: f"{v:.1f}x" if v else "-"),
+            }),
+        ], ignore_index=True)
         st.dataframe(peer_table, width="stretch", hide_index=True)
 
+
 # ── 밸류에이션 탭 ──
-with tab_val:
+@st.fragment
+def _render_val_tab():
     if not valuation:
         st.info("밸류에이션 데이터가 없습니다.")
     else:
@@ -1711,12 +1879,7 @@ with tab_val:
         disc_low = round((1 - band_low / per_share) * 100, 1) if per_share > 0 and band_low > 0 else None
 
         # 확정공모가 할인율
-        cp_val = 0
-        if confirmed_price and confirmed_price != "-":
-            try:
-                cp_val = int(str(confirmed_price).replace(",", ""))
-            except (ValueError, TypeError):
-                pass
+        cp_val = confirmed_price_int or 0
         disc_confirmed = round((1 - cp_val / per_share) * 100, 1) if per_share > 0 and cp_val > 0 else None
 
         # 현재가치 할인 적용 후 기준이익
@@ -1763,8 +1926,10 @@ with tab_val:
 
         st.markdown("<div style='height: 0.5rem'></div>", unsafe_allow_html=True)
 
+
 # ── 수급 탭 ──
-with tab_supply:
+@st.fragment
+def _render_supply_tab():
     col_l, col_r = st.columns(2)
 
     with col_l:
@@ -1776,9 +1941,7 @@ with tab_supply:
             "상장예정일": crawler.get("listing_date", "-"),
             "주관사": crawler.get("lead_underwriter", "-"),
         }
-        for k, v in schedule.items():
-            if v and v != "-":
-                st.markdown(f"**{k}**: {v}")
+        _render_kv_markdown(schedule)
 
     with col_r:
         st.markdown('<div class="section-header">수요예측 결과</div>', unsafe_allow_html=True)
@@ -1788,9 +1951,7 @@ with tab_supply:
             "기관배정": str(crawler.get("institutional_allocation", "-")).replace("\xa0", " ").replace("~", " ~ "),
             "일반배정": str(crawler.get("retail_allocation", "-")).replace("\xa0", " ").replace("~", " ~ "),
         }
-        for k, v in demand.items():
-            if v and v != "-":
-                st.markdown(f"**{k}**: {v}")
+        _render_kv_markdown(demand)
 
     if lockup:
         st.markdown('<div class="section-header">유통가능주식수</div>', unsafe_allow_html=True)
@@ -1801,18 +1962,19 @@ with tab_supply:
         with lc2:
             st.plotly_chart(build_lockup_timeline(lockup), key="lockup_tl", width="stretch")
 
-        lockup_table = []
-        for item in lockup:
-            lockup_table.append({
-                "기간": item.get("period", ""),
-                "주식수": f"{int(safe_num(item.get('shares', 0))):,}주",
-                "비율": fmt_pct(item.get("ratio")),
-                "누적비율": fmt_pct(item.get("cumulative_ratio")),
-            })
+        lockup_df = _records_frame(lockup, ["period", "shares", "ratio", "cumulative_ratio"])
+        lockup_table = pd.DataFrame({
+            "기간": lockup_df["period"].fillna(""),
+            "주식수": lockup_df["shares"].map(lambda v: f"{int(safe_num(v)):,}주"),
+            "비율": lockup_df["ratio"].map(fmt_pct),
+            "누적비율": lockup_df["cumulative_ratio"].map(fmt_pct),
+        })
         st.dataframe(lockup_table, width="stretch", hide_index=True)
 
+
 # ── 사업분석 탭 ──
-with tab_biz:
+@st.fragment
+def _render_biz_tab():
     if not business:
         st.info("사업 분석 데이터가 없습니다.")
     else:
@@ -1870,9 +2032,29 @@ with tab_biz:
             if fig_prod:
                 st.plotly_chart(fig_prod, key="products", width="stretch")
 
+
 # ── AI 리포트 탭 ──
-with tab_report:
+@st.fragment
+def _render_report_tab():
     if report_text:
         st.markdown(report_text)
     else:
         st.info("AI 분석 리포트가 없습니다.")
+
+
+tab_fin, tab_peer, tab_val, tab_supply, tab_biz, tab_report = st.tabs(
+    ["재무", "Peer 비교", "밸류에이션", "수급", "사업분석", "AI 리포트"]
+)
+
+with tab_fin:
+    _render_fin_tab()
+with tab_peer:
+    _render_peer_tab()
+with tab_val:
+    _render_val_tab()
+with tab_supply:
+    _render_supply_tab()
+with tab_biz:
+    _render_biz_tab()
+with tab_report:
+    _render_report_tab()
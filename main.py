@@ -4,35 +4,79 @@
     python main.py 리브스메드
     python main.py 리브스메드 --skip-filing    # 증권신고서 파싱 건너뛰기
     python main.py 리브스메드 --skip-analysis   # AI 분석 건너뛰기
+    python main.py 리브스메드 --no-cache        # DART·LLM 응답 캐시 무시하고 새로 조회
+    python main.py --batch companies.txt       # 파일의 회사명(한 줄에 하나)을 동시에 분석
+    python main.py 리브스메드 --quiet           # 단계 표시·경고만 출력
 """
 
 import argparse
+import asyncio
 import json
+import re
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경 → 표준 json.dumps
+    orjson = None
+
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
 from collectors.dart_api import (
+    aclose_async_client,
+    collect_all,
     download_document,
-    get_company_info,
-    get_equity_registration,
-    get_financials_multi_year,
     search_corp_code,
-    search_filings,
+    set_disk_cache,
 )
 from collectors.crawler_38 import search_by_name as search_38
 from parsers.financial import build_financial_summary, calc_growth_rates
 from parsers.offering import merge_offering_data, parse_equity_registration
-from parsers.llm_parser import parse_full_filing
-from analysis.analyst import generate_analysis
-from output.report_writer import save_report
-from output.excel_writer import generate_excel
 
 
-def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bool = False):
-    """IPO 리서치 전체 파이프라인을 실행한다."""
+# 공시명 분류 키워드 — 공시마다 한 번의 스캔으로 모두 찾는다
+_FILING_KEYWORD_RE = re.compile("증권신고서|발행실적|발행조건확정|기재정정|투자설명서|첨부")
+
+
+# 배치 실행 시 동시에 진행할 종목 수 (DART 호출 제한 고려)
+BATCH_CONCURRENCY = 4
+
+
+def _silent(*args, **kwargs) -> None:
+    """세부 출력을 생략할 때 print 대신 쓰는 no-op."""
+
+
+async def _run_and_close(coro):
+    """coro를 실행하고, 끝나면 이 이벤트 루프에서 만든 HTTP 클라이언트를 닫는다."""
+    try:
+        return await coro
+    finally:
+        await aclose_async_client()
+        # LLM 파서는 필요할 때만 import하므로 이미 로드된 경우에만 정리
+        llm_parser = sys.modules.get("parsers.llm_parser")
+        if llm_parser:
+            await llm_parser.aclose_client()
+
+
+async def run_pipeline(
+    company_name: str,
+    skip_filing: bool = False,
+    skip_analysis: bool = False,
+    echo_analysis: bool = True,
+    quiet: bool = False,
+):
+    """IPO 리서치 전체 파이프라인을 실행한다.
+
+    증권신고서 LLM 파싱은 비동기로, AI 분석처럼 오래 걸리는 동기 호출은 스레드로 넘겨
+    배치 실행 시 다른 종목의 진행을 막지 않는다.
+
+    터미널이 아니거나(파이프·배치) quiet이면 세부 수치 출력은 생략한다.
+    [Step N] 표시와 경고는 대시보드 진행률 파싱에 쓰이므로 항상 출력.
+    """
+    verbose = sys.stdout.isatty() and not quiet
+    log = print if verbose else _silent
     print(f"\n{'='*60}")
     print(f"  IPO 리서치: {company_name}")
     print(f"{'='*60}\n")
@@ -48,109 +92,131 @@ def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bo
         print(f"❌ '{company_name}' DART에서 찾을 수 없습니다.")
         return
     corp_code = corp["corp_code"]
-    print(f"  → {corp['corp_name']} (corp_code={corp_code}, stock_code={corp.get('stock_code', '')})")
+    log(f"  → {corp['corp_name']} (corp_code={corp_code}, stock_code={corp.get('stock_code', '')})")
 
-    # ==================================================================
-    # Step 2: DART 정형 데이터 수집
-    # ==================================================================
-    print("\n[Step 2] DART API 데이터 수집...")
-
-    # 기업개황
-    company_info = get_company_info(corp_code)
-    if company_info:
-        collected["company_info"] = company_info
-        print(f"  기업개황: {company_info.get('corp_name')} / {company_info.get('ceo_nm')} / {company_info.get('est_dt')}")
-
-    # 증권신고서 검색 — 기재정정본 > 원본 순으로 선택 (발행실적/투자설명서 제외)
-    filings = search_filings(corp_code, last_reprt_at="N")  # 정정본 포함
-    rcept_no = None
-    if filings:
-        # 우선순위: [기재정정]증권신고서 > 증권신고서 > 기타
-        candidates = []
-        for f in filings:
-            name = f.get("report_nm", "")
-            if "증권신고서" in name and "발행실적" not in name and "발행조건확정" not in name:
-                priority = 0 if "기재정정" in name else 1
-                candidates.append((priority, f))
-        candidates.sort(key=lambda x: x[0])
-
-        if candidates:
-            _, chosen = candidates[0]
-            rcept_no = chosen["rcept_no"]
-            print(f"  증권신고서: {chosen['report_nm']} ({chosen['rcept_dt']}) → rcept_no={rcept_no}")
-
-        # 투자설명서도 별도 저장 (사업내용이 더 자세할 수 있음)
-        invest_doc = None
-        for f in filings:
-            name = f.get("report_nm", "")
-            if "투자설명서" in name and "첨부" not in name:
-                invest_doc = f["rcept_no"]
-                print(f"  투자설명서: {name} ({f['rcept_dt']}) → rcept_no={invest_doc}")
-                break
-        collected["_invest_doc_rcept_no"] = invest_doc
-
-        # 못 찾으면 최신 공시로 fallback
-        if not rcept_no:
-            rcept_no = filings[0]["rcept_no"]
-            print(f"  최신 공시: {filings[0]['report_nm']} ({filings[0]['rcept_dt']}) → rcept_no={rcept_no}")
-
-    # 지분증권 API (공모사항)
-    equity_data = get_equity_registration(corp_code)
-    if equity_data:
-        offering = parse_equity_registration(equity_data)
-        collected["offering"] = offering
-        # 공모가 출력
-        securities = offering.get("securities", [])
-        if securities:
-            sec = securities[0]
-            print(f"  공모가: {sec.get('offering_price'):,}원 / 공모주식수: {sec.get('count'):,}주" if sec.get('offering_price') else "  공모가 정보 없음")
-
-    # 재무제표
-    print("  재무제표 수집 중...")
-    fin_raw = get_financials_multi_year(corp_code)
-    if fin_raw:
-        fin_summary = build_financial_summary(fin_raw)
-        fin_summary = calc_growth_rates(fin_summary)
-        collected["financials"] = fin_summary
-        for row in fin_summary:
-            rev = row.get("revenue")
-            rev_str = f"{rev/100_000_000:,.0f}억" if rev else "N/A"
-            yoy = row.get("revenue_yoy")
-            yoy_str = f" (YoY {yoy:+.1%})" if yoy else ""
-            print(f"  {row['year']}년 매출: {rev_str}{yoy_str}")
+    # 38.co.kr 크롤링은 DART와 무관하므로 Step 2 동안 미리 시작
+    crawler_task = asyncio.create_task(asyncio.to_thread(search_38, company_name))
 
-    # ==================================================================
-    # Step 3: 38.co.kr 크롤링
-    # ==================================================================
-    print("\n[Step 3] 38.co.kr 수요예측 데이터 수집...")
+    filing_task = None
     try:
-        crawler_data = search_38(company_name)
-    except Exception as e:
-        print(f"  ⚠️ 38.co.kr 크롤링 실패: {e}")
-        crawler_data = None
-    if crawler_data:
-        collected["crawler_data"] = crawler_data
-        print(f"  기관경쟁률: {crawler_data.get('institutional_competition', 'N/A')}")
-        print(f"  의무보유확약: {crawler_data.get('lockup_commitment', 'N/A')}")
-        print(f"  확정공모가: {crawler_data.get('confirmed_price', 'N/A')}")
-
-        # DART + crawler 데이터 통합
-        if "offering" in collected:
-            collected["offering"] = merge_offering_data(collected["offering"], crawler_data)
-    else:
-        print("  → 38.co.kr에서 데이터를 찾지 못했습니다 (이미 상장했거나 아직 미등록)")
+        # ==================================================================
+        # Step 2: DART 정형 데이터 수집
+        # ==================================================================
+        print("\n[Step 2] DART API 데이터 수집...")
+
+        # 기업개황·공시검색(정정본 포함)·지분증권·재무제표를 동시에 요청
+        company_info, filings, equity_data, fin_raw = await collect_all(corp_code, last_reprt_at="N")
+
+        # 기업개황
+        if company_info:
+            collected["company_info"] = company_info
+            log(f"  기업개황: {company_info.get('corp_name')} / {company_info.get('ceo_nm')} / {company_info.get('est_dt')}")
+
+        # 증권신고서 검색 — 기재정정본 > 원본 순으로 선택 (발행실적/투자설명서 제외)
+        rcept_no = None
+        if filings:
+            # 한 번 순회하며 고른다
+            #  - 증권신고서 우선순위: [기재정정]증권신고서 > 증권신고서 (발행실적/발행조건확정 제외)
+            #  - 투자설명서도 별도 저장 (사업내용이 더 자세할 수 있음)
+            chosen, chosen_priority = None, 2
+            invest = None
+            for f in filings:
+                hits = set(_FILING_KEYWORD_RE.findall(f.get("report_nm", "")))
+                if "증권신고서" in hits and "발행실적" not in hits and "발행조건확정" not in hits:
+                    priority = 0 if "기재정정" in hits else 1
+                    if priority < chosen_priority:
+                        chosen, chosen_priority = f, priority
+                if invest is None and "투자설명서" in hits and "첨부" not in hits:
+                    invest = f
+                if chosen_priority == 0 and invest is not None:
+                    break
+
+            if chosen:
+                rcept_no = chosen["rcept_no"]
+                log(f"  증권신고서: {chosen['report_nm']} ({chosen['rcept_dt']}) → rcept_no={rcept_no}")
+
+            invest_doc = invest["rcept_no"] if invest else None
+            if invest:
+                log(f"  투자설명서: {invest['report_nm']} ({invest['rcept_dt']}) → rcept_no={invest_doc}")
+            collected["_invest_doc_rcept_no"] = invest_doc
+
+            # 못 찾으면 최신 공시로 fallback
+            if not rcept_no:
+                rcept_no = filings[0]["rcept_no"]
+                log(f"  최신 공시: {filings[0]['report_nm']} ({filings[0]['rcept_dt']}) → rcept_no={rcept_no}")
+
+        # 증권신고서 원본(ZIP) 다운로드도 rcept_no가 정해지는 즉시 백그라운드로 시작
+        if not skip_filing and rcept_no:
+            filing_task = asyncio.create_task(asyncio.to_thread(download_document, rcept_no))
+
+        # 지분증권 API (공모사항)
+        if equity_data:
+            offering = parse_equity_registration(equity_data)
+            collected["offering"] = offering
+            # 공모가 출력
+            securities = offering.get("securities", [])
+            if securities:
+                sec = securities[0]
+                log(f"  공모가: {sec.get('offering_price'):,}원 / 공모주식수: {sec.get('count'):,}주" if sec.get('offering_price') else "  공모가 정보 없음")
+
+        # 재무제표
+        if fin_raw:
+            fin_summary = build_financial_summary(fin_raw)
+            fin_summary = calc_growth_rates(fin_summary)
+            collected["financials"] = fin_summary
+            if verbose:
+                for row in fin_summary:
+                    rev = row.get("revenue")
+                    rev_str = f"{rev/100_000_000:,.0f}억" if rev else "N/A"
+                    yoy = row.get("revenue_yoy")
+                    yoy_str = f" (YoY {yoy:+.1%})" if yoy else ""
+                    print(f"  {row['year']}년 매출: {rev_str}{yoy_str}")
+
+        # ==================================================================
+        # Step 3: 38.co.kr 크롤링
+        # ==================================================================
+        print("\n[Step 3] 38.co.kr 수요예측 데이터 수집...")
+        try:
+            crawler_data = await crawler_task
+        except Exception as e:
+            print(f"  ⚠️ 38.co.kr 크롤링 실패: {e}")
+            crawler_data = None
+        if crawler_data:
+            collected["crawler_data"] = crawler_data
+            log(f"  기관경쟁률: {crawler_data.get('institutional_competition', 'N/A')}")
+            log(f"  의무보유확약: {crawler_data.get('lockup_commitment', 'N/A')}")
+            log(f"  확정공모가: {crawler_data.get('confirmed_price', 'N/A')}")
+
+            # DART + crawler 데이터 통합
+            if "offering" in collected:
+                collected["offering"] = merge_offering_data(collected["offering"], crawler_data)
+        else:
+            print("  → 38.co.kr에서 데이터를 찾지 못했습니다 (이미 상장했거나 아직 미등록)")
+    except BaseException:
+        # 앞 단계에서 실패하면 미리 시작한 백그라운드 작업을 정리한다 (결과 미수거 경고 방지)
+        pending = [t for t in (crawler_task, filing_task) if t]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
 
     # ==================================================================
     # Step 4: 증권신고서 원본 → LLM 파싱
     # ==================================================================
     has_financials = bool(collected.get("financials"))
-    if not skip_filing and rcept_no:
+    if filing_task:
         print(f"\n[Step 4] 증권신고서 원본 다운로드 & LLM 파싱...")
         if not has_financials:
             print("  (DART API 재무제표 없음 → 증권신고서에서 추출 시도)")
-        filing_dir = download_document(rcept_no)
+        try:
+            filing_dir = await filing_task
+        except Exception as e:
+            print(f"  ⚠️ 증권신고서 다운로드 오류: {e}")
+            filing_dir = None
         if filing_dir:
-            parsed = parse_full_filing(filing_dir, need_financials=not has_financials)
+            from parsers.llm_parser import parse_full_filing
+
+            parsed = await parse_full_filing(filing_dir, need_financials=not has_financials)
             collected.update(parsed)
 
             # LLM 추출 재무제표를 financials에 통합
@@ -160,11 +226,12 @@ def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bo
                 fin_summary = _convert_filing_financials(fin_from_filing)
                 if fin_summary:
                     collected["financials"] = fin_summary
-                    print("  재무제표 (증권신고서 추출):")
-                    for row in fin_summary:
-                        rev = row.get("revenue")
-                        rev_str = f"{rev/100_000_000:,.0f}억" if rev else "N/A"
-                        print(f"    {row['year']}년 매출: {rev_str}")
+                    if verbose:
+                        print("  재무제표 (증권신고서 추출):")
+                        for row in fin_summary:
+                            rev = row.get("revenue")
+                            rev_str = f"{rev/100_000_000:,.0f}억" if rev else "N/A"
+                            print(f"    {row['year']}년 매출: {rev_str}")
         else:
             print("  → 증권신고서 다운로드 실패")
     elif skip_filing:
@@ -177,7 +244,11 @@ def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bo
     # ==================================================================
     if not skip_analysis:
         print(f"\n[Step 5] AI 종합 분석...")
-        analysis_report = generate_analysis(collected, company_name)
+        from analysis.analyst import generate_analysis
+
+        analysis_report = await asyncio.to_thread(
+            generate_analysis, collected, company_name, echo=echo_analysis,
+        )
         collected["analysis_report"] = analysis_report
     else:
         print(f"\n[Step 5] AI 분석 건너뛰기 (--skip-analysis)")
@@ -187,6 +258,8 @@ def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bo
     # Step 6: 출력
     # ==================================================================
     print(f"\n[Step 6] 리포트 생성...")
+    from output.excel_writer import generate_excel
+    from output.report_writer import save_report
 
     # 마크다운 리포트
     if analysis_report:
@@ -209,11 +282,6 @@ def run_pipeline(company_name: str, skip_filing: bool = False, skip_analysis: bo
     print(f"  📊 엑셀: {xlsx_path}")
     print(f"  💾 원본 데이터: {json_path}")
 
-    # 분석 리포트 콘솔 출력
-    if analysis_report:
-        print(f"\n{'─'*60}")
-        print(analysis_report)
-
     return collected
 
 
@@ -221,22 +289,19 @@ def _convert_filing_financials(filing_fin: list[dict]) -> list[dict]:
     """LLM이 증권신고서에서 추출한 재무제표를 기존 financials 형식으로 변환한다."""
     from parsers.financial import calc_growth_rates
 
-    result = []
+    # 연도별로 첫 번째 항목만 유지 (dict 삽입 순서로 중복 제거)
+    by_year: dict[str, dict] = {}
     for item in filing_fin:
-        # 연간 데이터만 사용 (반기/분기 제외)
-        period = item.get("period_type", "annual")
-        if period not in ("annual", "yearly"):
-            # 반기도 참고용으로 포함하되 표시
-            pass
-
         year = str(item.get("year", ""))
         # "2024.1Q" 같은 형식에서 연도만 추출
         if "." in year:
             year_part = year.split(".")[0]
         else:
             year_part = year[:4] if len(year) >= 4 else year
+        if year_part in by_year:
+            continue
 
-        row = {
+        by_year[year_part] = {
             "year": year_part,
             "revenue": item.get("revenue"),
             "operating_income": item.get("operating_income"),
@@ -247,16 +312,9 @@ def _convert_filing_financials(filing_fin: list[dict]) -> list[dict]:
             "operating_cashflow": item.get("operating_cashflow"),
             "source": "증권신고서",
         }
-        result.append(row)
 
-    # 연도순 정렬 & 중복 제거 (같은 연도면 첫 번째 우선)
-    seen = set()
-    unique = []
-    result.sort(key=lambda x: x["year"])
-    for r in result:
-        if r["year"] not in seen:
-            seen.add(r["year"])
-            unique.append(r)
+    # 연도순 정렬
+    unique = [by_year[y] for y in sorted(by_year)]
 
     return calc_growth_rates(unique) if unique else []
 
@@ -273,22 +331,97 @@ def save_raw_data(data: dict, company_name: str) -> Path:
     # analysis_report는 별도 파일이므로 제외
     save_data = {k: v for k, v in data.items() if k != "analysis_report"}
 
-    filepath.write_text(
-        json.dumps(save_data, ensure_ascii=False, indent=2, default=str),
-        encoding="utf-8",
-    )
+    # orjson은 UTF-8 bytes를 바로 반환 — datetime 등은 기존처럼 str()로 직렬화
+    if orjson:
+        filepath.write_bytes(orjson.dumps(
+            save_data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str,
+        ))
+    else:
+        filepath.write_text(
+            json.dumps(save_data, ensure_ascii=False, indent=2, default=str),
+            encoding="utf-8",
+        )
     print(f"[데이터] 저장 완료: {filepath}")
     return filepath
 
 
+async def run_batch(
+    company_names: list[str],
+    skip_filing: bool = False,
+    skip_analysis: bool = False,
+    quiet: bool = False,
+) -> dict[str, dict | None]:
+    """여러 종목을 최대 BATCH_CONCURRENCY개씩 동시에 분석한다.
+
+    한 종목이 실패해도 나머지는 계속 진행하고, 끝나면 종목별 결과를 요약 출력한다.
+    """
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def _run_one(name: str):
+        async with sem:
+            # 동시 실행 중에는 리포트 본문 실시간 출력을 끈다 (콘솔 출력이 섞이므로)
+            return await run_pipeline(
+                name, skip_filing=skip_filing, skip_analysis=skip_analysis,
+                echo_analysis=False, quiet=quiet,
+            )
+
+    results = await asyncio.gather(*(_run_one(n) for n in company_names), return_exceptions=True)
+
+    print(f"\n{'='*60}")
+    print(f"  배치 완료: {len(company_names)}개 종목")
+    print(f"{'='*60}")
+    summary: dict[str, dict | None] = {}
+    for name, result in zip(company_names, results):
+        if isinstance(result, BaseException):
+            print(f"  ❌ {name}: {result}")
+            summary[name] = None
+        else:
+            print(f"  {'✅' if result else '⚠️'} {name}")
+            summary[name] = result
+    return summary
+
+
+def _read_batch_file(path: str) -> list[str]:
+    """배치 파일에서 회사명을 읽는다 (빈 줄·# 주석 무시, 중복 제거)."""
+    names = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        name = line.strip()
+        if name and not name.startswith("#") and name not in names:
+            names.append(name)
+    return names
+
+
 def main():
     parser = argparse.ArgumentParser(description="IPO 공모주 리서치 자동화 도구")
-    parser.add_argument("company", help="분석할 회사명")
+    parser.add_argument("company", nargs="?", help="분석할 회사명")
+    parser.add_argument("--batch", metavar="FILE", help="회사명 목록 파일 (한 줄에 하나) — 동시에 분석")
     parser.add_argument("--skip-filing", action="store_true", help="증권신고서 파싱 건너뛰기")
     parser.add_argument("--skip-analysis", action="store_true", help="AI 분석 건너뛰기")
+    parser.add_argument("--no-cache", action="store_true", help="DART·LLM 응답 디스크 캐시 무시")
+    parser.add_argument("--quiet", action="store_true", help="단계 표시·경고 외 세부 출력 생략")
 
     args = parser.parse_args()
-    run_pipeline(args.company, skip_filing=args.skip_filing, skip_analysis=args.skip_analysis)
+    if not args.company and not args.batch:
+        parser.error("회사명 또는 --batch 파일을 지정하세요")
+    if args.no_cache:
+        from parsers.llm_parser import set_llm_cache
+
+        set_disk_cache(False)
+        set_llm_cache(False)
+
+    if args.batch:
+        names = _read_batch_file(args.batch)
+        if args.company and args.company not in names:
+            names.insert(0, args.company)
+        asyncio.run(_run_and_close(run_batch(
+            names, skip_filing=args.skip_filing, skip_analysis=args.skip_analysis, quiet=args.quiet,
+        )))
+    else:
+        asyncio.run(_run_and_close(run_pipeline(
+            args.company, skip_filing=args.skip_filing, skip_analysis=args.skip_analysis, quiet=args.quiet,
+        )))
 
 
 if __name__ == "__main__":
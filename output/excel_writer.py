@@ -3,11 +3,13 @@
 리브스메드 엑셀 포맷에 맞춰 IPO 리서치 시트를 생성한다.
 """
 
+import re
 from datetime import datetime
 from pathlib import Path
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 
 from config.settings import REPORTS_DIR
@@ -27,13 +29,32 @@ WRAP_ALIGNMENT = Alignment(wrap_text=True, vertical="top")
 NUM_FORMAT_KRW = '#,##0'
 NUM_FORMAT_PCT = '0.00%'
 
+# 셀마다 Font/Fill 객체를 붙이는 대신 통합문서에 한 번 등록한 이름 스타일을 지정한다
+_STYLE_TITLE = "ipo_title"
+_STYLE_HEADER = "ipo_header"
+_STYLE_SECTION = "ipo_section"
+_STYLE_KRW = "ipo_krw"
+_STYLE_PCT = "ipo_pct"
+_STYLE_WRAP = "ipo_wrap"
+
+
+def _register_styles(wb: Workbook) -> None:
+    """이 모듈에서 쓰는 이름 스타일을 통합문서에 등록한다."""
+    for style in (
+        NamedStyle(name=_STYLE_TITLE, font=TITLE_FONT),
+        NamedStyle(name=_STYLE_HEADER, font=HEADER_FONT),
+        NamedStyle(name=_STYLE_SECTION, font=SECTION_FONT, fill=SECTION_FILL),
+        NamedStyle(name=_STYLE_KRW, font=DEFAULT_FONT, number_format=NUM_FORMAT_KRW),
+        NamedStyle(name=_STYLE_PCT, font=DEFAULT_FONT, number_format=NUM_FORMAT_PCT),
+        NamedStyle(name=_STYLE_WRAP, font=DEFAULT_FONT, alignment=WRAP_ALIGNMENT),
+    ):
+        wb.add_named_style(style)
+
 
 def _write_section_header(ws, row: int, title: str, cols: int = 13):
     """섹션 헤더를 작성한다."""
     for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.fill = SECTION_FILL
-        cell.font = SECTION_FONT
+        ws.cell(row=row, column=c).style = _STYLE_SECTION
     ws.cell(row=row, column=1, value=title)
 
 
@@ -42,6 +63,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
     wb = Workbook()
+    _register_styles(wb)
     ws = wb.active
     ws.title = company_name
 
@@ -55,7 +77,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
     # =====================================================================
     # 1. 타이틀
     # =====================================================================
-    ws.cell(row=row, column=1, value=company_name).font = TITLE_FONT
+    ws.cell(row=row, column=1, value=company_name).style = _STYLE_TITLE
     ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=13)
     row += 2
 
@@ -76,7 +98,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
         ("주관사", crawler.get("lead_underwriter", "")),
     ]
     for label, val in schedule_items:
-        ws.cell(row=row, column=1, value=label).font = HEADER_FONT
+        ws.cell(row=row, column=1, value=label).style = _STYLE_HEADER
         ws.cell(row=row, column=2, value=val)
         row += 1
 
@@ -100,17 +122,17 @@ def generate_excel(data: dict, company_name: str) -> Path:
         ("공모방법", sec.get("method", "")),
     ]
     for label, val in offering_items:
-        ws.cell(row=row, column=1, value=label).font = HEADER_FONT
+        ws.cell(row=row, column=1, value=label).style = _STYLE_HEADER
         cell = ws.cell(row=row, column=2, value=val)
         if isinstance(val, (int, float)):
-            cell.number_format = NUM_FORMAT_KRW
+            cell.style = _STYLE_KRW
         row += 1
 
     # 주관사
     underwriters = offering.get("underwriters", [])
     if underwriters:
         row += 1
-        ws.cell(row=row, column=1, value="주관사").font = HEADER_FONT
+        ws.cell(row=row, column=1, value="주관사").style = _STYLE_HEADER
         ws.cell(row=row, column=2, value="인수수량")
         ws.cell(row=row, column=3, value="인수금액")
         row += 1
@@ -136,7 +158,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
         ]
         for label, val in demand_items:
             if val:
-                ws.cell(row=row, column=1, value=label).font = HEADER_FONT
+                ws.cell(row=row, column=1, value=label).style = _STYLE_HEADER
                 ws.cell(row=row, column=2, value=val)
                 row += 1
         row += 1
@@ -150,7 +172,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
         row += 1
         headers = ["의무보유기간", "주식수", "비율", "누적비율"]
         for i, h in enumerate(headers, 1):
-            ws.cell(row=row, column=i, value=h).font = HEADER_FONT
+            ws.cell(row=row, column=i, value=h).style = _STYLE_HEADER
         row += 1
         for item in lockup:
             ws.cell(row=row, column=1, value=item.get("period", ""))
@@ -158,9 +180,9 @@ def generate_excel(data: dict, company_name: str) -> Path:
             ratio_cell = ws.cell(row=row, column=3, value=item.get("ratio"))
             cum_cell = ws.cell(row=row, column=4, value=item.get("cumulative_ratio"))
             if isinstance(item.get("ratio"), (int, float)):
-                ratio_cell.number_format = NUM_FORMAT_PCT
+                ratio_cell.style = _STYLE_PCT
             if isinstance(item.get("cumulative_ratio"), (int, float)):
-                cum_cell.number_format = NUM_FORMAT_PCT
+                cum_cell.style = _STYLE_PCT
             row += 1
         row += 1
 
@@ -173,7 +195,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
         row += 1
         fin_headers = ["구분"] + [f.get("year", "") for f in financials]
         for i, h in enumerate(fin_headers, 1):
-            ws.cell(row=row, column=i, value=h).font = HEADER_FONT
+            ws.cell(row=row, column=i, value=h).style = _STYLE_HEADER
         row += 1
 
         for field, label in [
@@ -184,19 +206,19 @@ def generate_excel(data: dict, company_name: str) -> Path:
             ("operating_income", "영업이익"),
             ("net_income", "당기순이익"),
         ]:
-            ws.cell(row=row, column=1, value=label).font = HEADER_FONT
+            ws.cell(row=row, column=1, value=label).style = _STYLE_HEADER
             for i, f in enumerate(financials, 2):
                 cell = ws.cell(row=row, column=i, value=f.get(field))
-                cell.number_format = NUM_FORMAT_KRW
+                cell.style = _STYLE_KRW
             row += 1
 
         # YoY 성장률
-        ws.cell(row=row, column=1, value="매출 YoY").font = HEADER_FONT
+        ws.cell(row=row, column=1, value="매출 YoY").style = _STYLE_HEADER
         for i, f in enumerate(financials, 2):
             yoy = f.get("revenue_yoy")
             if yoy is not None:
                 cell = ws.cell(row=row, column=i, value=yoy)
-                cell.number_format = NUM_FORMAT_PCT
+                cell.style = _STYLE_PCT
         row += 1
         row += 1
 
@@ -217,7 +239,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
             ("주당 평가가액", valuation.get("per_share_value")),
         ]
         for label, val in val_items:
-            ws.cell(row=row, column=1, value=label).font = HEADER_FONT
+            ws.cell(row=row, column=1, value=label).style = _STYLE_HEADER
             # 리스트/튜플 값은 문자열로 변환 (예: discount_rate=[0.353, 0.1913])
             if isinstance(val, (list, tuple)):
                 val = ", ".join(str(v) for v in val)
@@ -227,7 +249,7 @@ def generate_excel(data: dict, company_name: str) -> Path:
         # 평균 PER
         avg_per = valuation.get("average_peer_per")
         if avg_per:
-            ws.cell(row=row, column=1, value="비교회사 평균 PER").font = HEADER_FONT
+            ws.cell(row=row, column=1, value="비교회사 평균 PER").style = _STYLE_HEADER
             ws.cell(row=row, column=2, value=avg_per)
             row += 1
 
@@ -235,24 +257,28 @@ def generate_excel(data: dict, company_name: str) -> Path:
         peers = valuation.get("peers", [])
         if peers:
             row += 1
-            ws.cell(row=row, column=1, value="Peer Group").font = HEADER_FONT
+            ws.cell(row=row, column=1, value="Peer Group").style = _STYLE_HEADER
             row += 1
             peer_headers = ["회사", "거래소", "매출액", "당기순이익", "시가총액", "기준주가", "PER", "EV/EBITDA"]
             for i, h in enumerate(peer_headers, 1):
-                ws.cell(row=row, column=i, value=h).font = HEADER_FONT
+                ws.cell(row=row, column=i, value=h).style = _STYLE_HEADER
             row += 1
             for peer in peers:
-                ws.cell(row=row, column=1, value=peer.get("name", ""))
-                ws.cell(row=row, column=2, value=peer.get("market", ""))
-                c_rev = ws.cell(row=row, column=3, value=peer.get("revenue"))
-                c_ni = ws.cell(row=row, column=4, value=peer.get("net_income"))
-                c_mc = ws.cell(row=row, column=5, value=peer.get("market_cap"))
-                c_sp = ws.cell(row=row, column=6, value=peer.get("share_price"))
-                ws.cell(row=row, column=7, value=peer.get("per"))
-                ws.cell(row=row, column=8, value=peer.get("ev_ebitda"))
-                for c in [c_rev, c_ni, c_mc, c_sp]:
+                # 헤더 행 바로 다음부터 한 행씩 통째로 추가 (append는 마지막 행 다음에 쓴다)
+                ws.append([
+                    peer.get("name", ""),
+                    peer.get("market", ""),
+                    peer.get("revenue"),
+                    peer.get("net_income"),
+                    peer.get("market_cap"),
+                    peer.get("share_price"),
+                    peer.get("per"),
+                    peer.get("ev_ebitda"),
+                ])
+                # 매출액·당기순이익·시가총액·기준주가 (C~F)
+                for c in ws[row][2:6]:
                     if isinstance(c.value, (int, float)):
-                        c.number_format = NUM_FORMAT_KRW
+                        c.style = _STYLE_KRW
                 row += 1
         row += 1
 
@@ -265,15 +291,14 @@ def generate_excel(data: dict, company_name: str) -> Path:
         row += 1
         # 분석 리포트에서 종합 의견 섹션만 추출
         opinion_section = _extract_opinion(analysis)
-        ws.cell(row=row, column=1, value=opinion_section).alignment = WRAP_ALIGNMENT
+        ws.cell(row=row, column=1, value=opinion_section).style = _STYLE_WRAP
         ws.merge_cells(start_row=row, start_column=1, end_row=row + 10, end_column=13)
         ws.row_dimensions[row].height = 200
         row += 12
 
-    # 테두리 적용
-    for r in range(1, row):
-        for c in range(1, 14):
-            cell = ws.cell(row=r, column=c)
+    # 테두리 적용 — 좌표별 ws.cell() 조회 대신 범위를 한 번에 순회
+    for cells in ws.iter_rows(min_row=1, max_row=row - 1, min_col=1, max_col=13):
+        for cell in cells:
             cell.border = THIN_BORDER
 
     # 저장
@@ -285,16 +310,11 @@ def generate_excel(data: dict, company_name: str) -> Path:
     return filepath
 
 
-def _extract_opinion(report: str) -> str:
-    """분석 리포트에서 종합의견 + 체크포인트를 추출한다."""
-    lines = report.split("\n")
-    capture = False
-    result = []
+# 종합의견/체크포인트 섹션이 시작되는 줄 (줄 시작 위치를 잡는다)
+_OPINION_RE = re.compile(r"^[^\n]*(?:종합 ?의견|핵심 체크)", re.MULTILINE)
 
-    for line in lines:
-        if "종합 의견" in line or "종합의견" in line or "핵심 체크" in line:
-            capture = True
-        if capture:
-            result.append(line)
 
-    return "\n".join(result) if result else report[-2000:]
+def _extract_opinion(report: str) -> str:
+    """분석 리포트에서 종합의견 + 체크포인트를 추출한다."""
+    match = _OPINION_RE.search(report)
+    return report[match.start():] if match else report[-2000:]
@@ -21,44 +21,51 @@ def save_report(
     filename = f"{today}_{company_name}_리서치.md"
     filepath = REPORTS_DIR / filename
 
-    content_parts = [analysis_report]
-
-    # 데이터 요약 부록
-    content_parts.append("\n\n---\n\n## 부록: 수집 데이터 요약\n")
-
-    # 재무제표 테이블
-    if "financials" in data and data["financials"]:
-        content_parts.append("### 재무제표\n")
-        content_parts.append("| 연도 | 매출액 | 영업이익 | 당기순이익 | 자산총계 | 부채총계 |")
-        content_parts.append("|------|--------|----------|-----------|---------|---------|")
-        for row in data["financials"]:
-            content_parts.append(
-                f"| {row.get('year', '')} "
-                f"| {_fmt_num(row.get('revenue'))} "
-                f"| {_fmt_num(row.get('operating_income'))} "
-                f"| {_fmt_num(row.get('net_income'))} "
-                f"| {_fmt_num(row.get('total_assets'))} "
-                f"| {_fmt_num(row.get('total_liabilities'))} |"
-            )
-        content_parts.append("")
-
-    # 유통가능주식수
-    if "lockup_schedule" in data and data["lockup_schedule"]:
-        content_parts.append("### 유통가능주식수\n")
-        content_parts.append("| 기간 | 주식수 | 비율 | 누적비율 |")
-        content_parts.append("|------|--------|------|---------|")
-        for item in data["lockup_schedule"]:
-            content_parts.append(
-                f"| {item.get('period', '')} "
-                f"| {_fmt_shares(item.get('shares'))} "
-                f"| {_fmt_pct(item.get('ratio'))} "
-                f"| {_fmt_pct(item.get('cumulative_ratio'))} |"
-            )
-        content_parts.append("")
-
-    content_parts.append(f"\n\n---\n*생성일: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n")
-
-    filepath.write_text("\n".join(content_parts), encoding="utf-8")
+    # 중간 리스트/join 없이 파일에 바로 쓴다. 각 줄은 앞에 개행을 붙여 이어 쓴다.
+    with filepath.open("w", encoding="utf-8") as f:
+        write = f.write
+
+        def line(text: str = "") -> None:
+            write("\n")
+            write(text)
+
+        write(analysis_report)
+
+        # 데이터 요약 부록
+        line("\n\n---\n\n## 부록: 수집 데이터 요약\n")
+
+        # 재무제표 테이블
+        if "financials" in data and data["financials"]:
+            line("### 재무제표\n")
+            line("| 연도 | 매출액 | 영업이익 | 당기순이익 | 자산총계 | 부채총계 |")
+            line("|------|--------|----------|-----------|---------|---------|")
+            for row in data["financials"]:
+                line(
+                    f"| {row.get('year', '')} "
+                    f"| {_fmt_num(row.get('revenue'))} "
+                    f"| {_fmt_num(row.get('operating_income'))} "
+                    f"| {_fmt_num(row.get('net_income'))} "
+                    f"| {_fmt_num(row.get('total_assets'))} "
+                    f"| {_fmt_num(row.get('total_liabilities'))} |"
+                )
+            line()
+
+        # 유통가능주식수
+        if "lockup_schedule" in data and data["lockup_schedule"]:
+            line("### 유통가능주식수\n")
+            line("| 기간 | 주식수 | 비율 | 누적비율 |")
+            line("|------|--------|------|---------|")
+            for item in data["lockup_schedule"]:
+                line(
+                    f"| {item.get('period', '')} "
+                    f"| {_fmt_shares(item.get('shares'))} "
+                    f"| {_fmt_pct(item.get('ratio'))} "
+                    f"| {_fmt_pct(item.get('cumulative_ratio'))} |"
+                )
+            line()
+
+        line(f"\n\n---\n*생성일: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n")
+
     print(f"[리포트] 저장 완료: {filepath}")
     return filepath
 
@@ -67,16 +74,18 @@ def _fmt_num(val) -> str:
     """숫자를 억원 단위로 포맷."""
     if val is None:
         return "-"
-    try:
-        v = int(val)
-        if abs(v) >= 100_000_000:
-            return f"{v / 100_000_000:,.1f}억"
-        elif abs(v) >= 10_000:
-            return f"{v / 10_000:,.0f}만"
-        else:
-            return f"{v:,}"
-    except (ValueError, TypeError):
-        return str(val)
+    # 대부분 int로 들어오므로 변환(try/except)은 그 외 타입에서만
+    if not isinstance(val, int):
+        try:
+            val = int(val)
+        except (ValueError, TypeError):
+            return str(val)
+    av = abs(val)
+    if av >= 100_000_000:
+        return f"{val / 100_000_000:,.1f}억"
+    if av >= 10_000:
+        return f"{val / 10_000:,.0f}만"
+    return f"{val:,}"
 
 
 def _fmt_shares(val) -> str:
@@ -3,21 +3,28 @@
 DART API에서 받은 재무제표 raw 데이터를 정리된 딕셔너리로 변환한다.
 """
 
+import re
+
+
+# 금액 문자열에서 한 번에 지울 문자 (콤마·공백류)
+_STRIP_TBL = str.maketrans("", "", ", \t\n\r\xa0")
+# int() 실패 시 float 변환을 시도할 만한 형태인지 (소수/지수 표기)
+_NUMERIC_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
 
 def _parse_amount(val: str | None) -> int | None:
     """금액 문자열 → 정수. 콤마, 공백 제거."""
     if not val:
         return None
-    cleaned = val.replace(",", "").replace(" ", "").strip()
+    cleaned = val.translate(_STRIP_TBL)
     if not cleaned or cleaned == "-":
         return None
     try:
         return int(cleaned)
     except ValueError:
-        try:
+        if _NUMERIC_RE.fullmatch(cleaned):
             return int(float(cleaned))
-        except ValueError:
-            return None
+        return None
 
 
 # 관심 계정 목록
@@ -31,6 +38,9 @@ KEY_ACCOUNTS = {
     "영업활동현금흐름": "operating_cashflow",
 }
 
+# YoY 성장률을 계산할 항목
+_GROWTH_FIELDS = ("revenue", "operating_income", "net_income")
+
 
 def parse_financials(raw_items: list[dict]) -> dict:
     """DART 재무제표 API 응답을 정리된 딕셔너리로 변환.
@@ -48,18 +58,13 @@ def parse_financials(raw_items: list[dict]) -> dict:
     result: dict[str, dict] = {}
 
     for item in raw_items:
-        fs_type = "연결" if item.get("fs_div") == "CFS" else "별도"
-        account_name = item.get("account_nm", "")
-
-        if account_name not in KEY_ACCOUNTS:
+        # 관심 계정이 아니면 (대부분의 항목) 다른 필드를 보기 전에 건너뛴다
+        field = KEY_ACCOUNTS.get(item.get("account_nm", ""))
+        if field is None:
             continue
 
-        field = KEY_ACCOUNTS[account_name]
-
-        if fs_type not in result:
-            result[fs_type] = {}
-
-        result[fs_type][field] = {
+        fs_type = "연결" if item.get("fs_div") == "CFS" else "별도"
+        result.setdefault(fs_type, {})[field] = {
             "current": _parse_amount(item.get("thstrm_amount")),
             "prior": _parse_amount(item.get("frmtrm_amount")),
             "two_yr_prior": _parse_amount(item.get("bfefrmtrm_amount")),
@@ -80,31 +85,31 @@ def build_financial_summary(multi_year: dict[str, list[dict]]) -> list[dict]:
             ...
         ]
     """
-    yearly: dict[str, dict] = {}
-
-    for year, items in multi_year.items():
-        parsed = parse_financials(items)
+    summary = []
+    for year in sorted(multi_year):
+        # 한 번 훑으면서 연결/별도별 당기 금액 문자열만 모은다 (선택된 쪽만 숫자로 변환)
+        by_fs: dict[bool, dict[str, str]] = {True: {}, False: {}}
+        for item in multi_year[year]:
+            field = KEY_ACCOUNTS.get(item.get("account_nm", ""))
+            if field:
+                by_fs[item.get("fs_div") == "CFS"][field] = item.get("thstrm_amount")
         # 연결 우선, 없으면 별도
-        fs = parsed.get("연결") or parsed.get("별도") or {}
+        amounts = by_fs[True] or by_fs[False]
 
         row = {"year": year}
         for field in KEY_ACCOUNTS.values():
-            data = fs.get(field, {})
-            row[field] = data.get("current")
-        yearly[year] = row
+            row[field] = _parse_amount(amounts.get(field))
+        summary.append(row)
 
-    # 연도순 정렬
-    return [yearly[y] for y in sorted(yearly.keys())]
+    return summary
 
 
 def calc_growth_rates(summary: list[dict]) -> list[dict]:
     """연도별 요약에 YoY 성장률을 추가한다."""
-    for i in range(1, len(summary)):
-        prev = summary[i - 1]
-        curr = summary[i]
-        for field in ["revenue", "operating_income", "net_income"]:
+    for prev, curr in zip(summary, summary[1:]):
+        for field in _GROWTH_FIELDS:
             prev_val = prev.get(field)
             curr_val = curr.get(field)
-            if prev_val and curr_val and prev_val != 0:
+            if prev_val and curr_val:
                 curr[f"{field}_yoy"] = (curr_val - prev_val) / abs(prev_val)
     return summary
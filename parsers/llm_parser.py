@@ -4,37 +4,204 @@
 사업내용 등 비정형 데이터를 Claude API로 추출한다.
 """
 
+import asyncio
+import functools
+import hashlib
+import html as html_lib
 import json
+import os
 import re
 from pathlib import Path
 
 import anthropic
 
-from config.settings import ANTHROPIC_API_KEY, LLM_MODEL
+from config.settings import ANTHROPIC_API_KEY, CACHE_DIR, LLM_MODEL_FAST, LLM_MODEL_SMART
+
+# Claude API 연결 풀 — 추출 호출 여러 개를 동시에 보내므로 HTTP/2로 한 연결에 다중화하고
+# keep-alive 연결을 넉넉히 남겨 TLS 재협상을 피한다.
+# SDK 버전에 따라 내부 HTTP 라이브러리(httpx/httpx2)가 달라 SDK가 노출하는 클래스로 만든다.
+_LLM_POOL_LIMITS = type(anthropic.DEFAULT_CONNECTION_LIMITS)(max_keepalive_connections=16, max_connections=32)
+# 연결이 안 되면 빨리 실패하되, 통합 추출 호출은 출력이 길어 읽기 제한은 여유 있게 둔다
+_LLM_TIMEOUT = anthropic.Timeout(120.0, connect=5.0)
+
+# AsyncAnthropic의 HTTP 연결 풀은 이벤트 루프에 묶이므로 루프별로 하나씩 만든다
+_async_state: tuple[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic] | None = None
+
+_JSON_FENCE = "```json"
+_JSON_CLOSERS = {"{": "}", "[": "]"}
+_NUMS_RE = re.compile(r"\d{3,}")
+_TABLE_RE = re.compile(r"<table", re.IGNORECASE)
+
+# LLM에 보내기 전 HTML 압축용 — 표 구조(table/tr/td, TITLE)와 병합 속성만 남긴다
+_STYLE_SCRIPT_RE = re.compile(r"<(style|script)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_INLINE_TAG_RE = re.compile(r"</?(?:span|font|b)\b[^>]*>", re.IGNORECASE)
+_BR_RE = re.compile(r"<br\b[^>]*>", re.IGNORECASE)
+_TAG_ATTRS_RE = re.compile(r"<(\w+)\s[^>]*>")
+_SPAN_ATTR_RE = re.compile(r"\b(?:colspan|rowspan)\s*=\s*[\"']?\d+[\"']?", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+
+# JSON 코드 블록을 닫은 직후 생성을 멈추게 한다 (뒤에 붙는 설명문 토큰 절약)
+_STOP_SEQUENCES = ["```\n\n"]
+
+# 본문 키워드 탐색에서 이 정도면 충분히 데이터가 풍부한 구간으로 보고 더 찾지 않는다
+_SECTION_GOOD_SCORE = 100
+_SECTION_GOOD_TABLES = 3
+
+
+def _llm_params(
+    system: str,
+    user: str,
+    max_tokens: int = 4096,
+    context: str | list[str] | None = None,
+    model: str | None = None,
+) -> dict:
+    """messages.create(및 Batch 요청 params)에 넘길 인자를 만든다.
+
+    model을 지정하지 않으면 LLM_MODEL_SMART를 쓴다.
+
+    context(증권신고서 HTML 발췌)를 주면 user 메시지의 앞 블록들로 보내고
+    작업 지시(user)는 그 뒤에 둔다. 여러 발췌는 목록으로 넘기면 이어 붙이지 않고
+    블록 단위로 보낸다.
+
+    prompt caching은 걸지 않는다 — 추출 작업마다 system·발췌가 달라 캐시를 읽을
+    호출이 없고, 같은 요청의 재실행은 응답 디스크 캐시가 먼저 받는다.
+    """
+    if context:
+        parts = [context] if isinstance(context, str) else context
+        content = [{"type": "text", "text": part} for part in parts]
+        content.append({"type": "text", "text": user})
+    else:
+        content = user
+    return {
+        "model": model or LLM_MODEL_SMART,
+        "max_tokens": max_tokens,
+        "system": system,
+        "messages": [{"role": "user", "content": content}],
+        "stop_sequences": _STOP_SEQUENCES,
+    }
 
-client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
+def _message_text(message) -> str:
+    """응답 본문. stop sequence에서 멈췄으면 잘린 닫는 문자열을 되붙인다 (``` 펜스 복원)."""
+    text = message.content[0].text
+    if message.stop_reason == "stop_sequence" and message.stop_sequence:
+        text += message.stop_sequence
+    return text
+
+
+def _get_client() -> anthropic.AsyncAnthropic:
+    global _async_state
+    loop = asyncio.get_running_loop()
+    if _async_state is None or _async_state[0] is not loop:
+        _async_state = (loop, anthropic.AsyncAnthropic(
+            api_key=ANTHROPIC_API_KEY,
+            timeout=_LLM_TIMEOUT,
+            http_client=anthropic.DefaultAsyncHttpxClient(http2=True, limits=_LLM_POOL_LIMITS),
+        ))
+    return _async_state[1]
+
+
+async def aclose_client() -> None:
+    """현재 이벤트 루프에서 만든 AsyncAnthropic 클라이언트(연결 풀)를 닫는다."""
+    global _async_state
+    if _async_state is not None and _async_state[0] is asyncio.get_running_loop():
+        client = _async_state[1]
+        _async_state = None
+        await client.close()
+
+
+# ---------------------------------------------------------------------------
+# 응답 디스크 캐시 (같은 증권신고서를 다시 파싱할 때 토큰 재지출 방지)
+# ---------------------------------------------------------------------------
+
+_llm_cache_enabled = True
+
+
+def set_llm_cache(enabled: bool) -> None:
+    """LLM 응답 캐시 읽기를 켜고 끈다 (--no-cache). 꺼도 새 응답은 저장한다."""
+    global _llm_cache_enabled
+    _llm_cache_enabled = enabled
 
-def _call_llm(system: str, user: str, max_tokens: int = 4096) -> str:
-    """Claude API 호출 래퍼."""
-    resp = client.messages.create(
-        model=LLM_MODEL,
-        max_tokens=max_tokens,
-        system=system,
-        messages=[{"role": "user", "content": user}],
-    )
-    return resp.content[0].text
+
+def _cache_path(params: dict) -> Path:
+    """요청 인자 전체(모델·프롬프트·발췌·max_tokens 등)의 해시로 캐시 파일 경로를 정한다."""
+    key = hashlib.blake2b(
+        json.dumps(params, sort_keys=True, ensure_ascii=False).encode(), digest_size=16,
+    ).hexdigest()
+    return CACHE_DIR / "llm" / f"{key}.json"
+
+
+def _load_cached(path: Path) -> str | None:
+    if not _llm_cache_enabled:
+        return None
+    try:
+        return json.loads(path.read_bytes())["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_cached(path: Path, model: str, text: str) -> None:
+    # JSON을 얻지 못한 응답은 저장하지 않는다 (다음 실행에서 다시 시도되도록)
+    if _extract_json(text) is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"model": model, "text": text}, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+async def _call_llm(
+    system: str,
+    user: str,
+    max_tokens: int = 4096,
+    context: str | list[str] | None = None,
+    model: str | None = None,
+) -> str:
+    """Claude API 호출 래퍼. 같은 요청의 응답이 디스크 캐시에 있으면 그것을 쓴다."""
+    params = _llm_params(system, user, max_tokens, context, model)
+    path = _cache_path(params)
+    text = _load_cached(path)
+    if text is not None:
+        print("[LLM Parser] 캐시 사용")
+        return text
+
+    resp = await _get_client().messages.create(**params)
+    text = _message_text(resp)
+    _store_cached(path, params["model"], text)
+    return text
+
+
+async def _call_json(request: dict | None) -> dict | list | None:
+    """_call_llm 인자(request)로 호출해 JSON을 추출한다. request가 None이면 None.
+
+    빠른 모델 응답에서 JSON을 얻지 못하면 기본 모델로 한 번 더 시도한다.
+    """
+    if not request:
+        return None
+    result = _extract_json(await _call_llm(**request))
+    if result is None and request.get("model") == LLM_MODEL_FAST:
+        print("[LLM Parser] 빠른 모델 응답 파싱 실패 → 기본 모델로 재시도")
+        result = _extract_json(await _call_llm(**{**request, "model": LLM_MODEL_SMART}))
+    return result
+
+
+async def _none() -> None:
+    """asyncio.gather 자리 채우기용 (건너뛰는 작업)."""
+    return None
 
 
 def _extract_json(text: str) -> dict | list | None:
     """LLM 응답에서 JSON 블록을 추출한다."""
-    # ```json ... ``` 블록 찾기
-    match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
+    # ```json ... ``` 블록 찾기 (정규식 대신 find — 펜스가 없는 긴 응답도 한 번만 훑는다)
+    i = text.find(_JSON_FENCE)
+    if i >= 0:
+        j = text.find("```", i + len(_JSON_FENCE))
+        if j >= 0:
+            try:
+                return json.loads(text[i + len(_JSON_FENCE):j].strip())
+            except json.JSONDecodeError:
+                pass
 
     # 전체를 JSON으로 시도
     try:
@@ -42,15 +209,60 @@ def _extract_json(text: str) -> dict | list | None:
     except json.JSONDecodeError:
         pass
 
-    # { 또는 [ 로 시작하는 부분 찾기
-    for pattern in [r"(\{.*\})", r"(\[.*\])"]:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except json.JSONDecodeError:
-                continue
+    # 괄호가 맞아떨어지는 구간을 객체({) 먼저, 그다음 배열([) 순서로 시도한다.
+    # 단, JSON 배열 안에 든 객체(목록의 원소)는 건너뛰어 목록 일부만 돌려주지 않는다.
+    arrays = list(_json_spans(text, "["))
+    for start, _, value in _json_spans(text, "{"):
+        if not any(a_start < start < a_end for a_start, a_end, _ in arrays):
+            return value
+    return arrays[0][2] if arrays else None
 
+
+def _json_spans(text: str, open_ch: str):
+    """open_ch로 시작해 JSON으로 읽히는 구간 (시작, 끝, 값)을 앞에서부터 차례로 낸다.
+
+    읽힌 구간의 안쪽은 다시 보지 않는다.
+    """
+    pos = 0
+    while (span := _find_json_span(text, open_ch, pos)) is not None:
+        start, end = span
+        try:
+            value = json.loads(text[start:end])
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        yield start, end, value
+        pos = end
+
+
+def _find_json_span(text: str, open_ch: str, start: int = 0) -> tuple[int, int] | None:
+    """start 이후 open_ch({ 또는 [)로 시작해 괄호가 균형을 이루는 첫 구간 (시작, 끝)을 찾는다.
+
+    한 번 훑으면서 깊이를 세고, 문자열 리터럴 안의 괄호와 \\ 이스케이프는 무시한다.
+    괄호가 어긋나거나 끝까지 닫히지 않는 여는 괄호는 그것만 건너뛰고 다음 open_ch부터 다시 찾는다.
+    """
+    while (begin := text.find(open_ch, start)) >= 0:
+        stack: list[str] = []
+        in_str = escaped = False
+        for i in range(begin, len(text)):
+            ch = text[i]
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch in _JSON_CLOSERS:
+                stack.append(_JSON_CLOSERS[ch])
+            elif ch == "}" or ch == "]":
+                if ch != stack.pop():
+                    break  # 괄호 불일치 → 다음 여는 괄호부터
+                if not stack:
+                    return begin, i + 1
+        start = begin + 1
     return None
 
 
@@ -60,25 +272,97 @@ def _extract_json(text: str) -> dict | list | None:
 
 
 def load_filing_html(filing_dir: Path) -> str:
-    """다운로드된 증권신고서 HTML 파일들을 하나의 텍스트로 합친다."""
+    """다운로드된 증권신고서 HTML 파일들을 하나의 텍스트로 합친다.
+
+    같은 디렉토리를 다시 읽으면 (파일 목록·수정시각·크기가 그대로인 한)
+    메모리에 둔 결과를 재사용한다.
+    """
     html_files = sorted(filing_dir.glob("*.html")) + sorted(filing_dir.glob("*.htm"))
     if not html_files:
         # XML 파일 시도
         html_files = sorted(filing_dir.glob("*.xml"))
 
-    combined = ""
+    signature = []
     for f in html_files:
         try:
-            content = f.read_text(encoding="utf-8", errors="ignore")
-            combined += f"\n<!-- FILE: {f.name} -->\n{content}"
-        except Exception:
-            try:
-                content = f.read_text(encoding="euc-kr", errors="ignore")
-                combined += f"\n<!-- FILE: {f.name} -->\n{content}"
-            except Exception:
-                continue
+            st = f.stat()
+        except OSError:
+            continue
+        signature.append((f, st.st_mtime_ns, st.st_size))
+    return _load_filing_files(tuple(signature))
+
 
-    return combined
+_ASCII_BYTES = bytes(range(128))
+
+
+def _decode_filing(data: bytes) -> str:
+    """증권신고서 파일 바이트를 문자열로. BOM → UTF-8 → CP949(EUC-KR 상위집합) 순.
+
+    이전 공시 일부는 EUC-KR이라 UTF-8로 무시 디코딩하면 한글이 사라진다.
+    UTF-8 오류가 비ASCII 바이트의 10% 이하이면 깨진 바이트가 조금 섞인 UTF-8로 본다.
+    """
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="ignore")
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="ignore")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    text = data.decode("utf-8", errors="replace")
+    non_ascii = len(data.translate(None, _ASCII_BYTES))
+    if text.count("\ufffd") <= non_ascii * 0.1:
+        return text.replace("\ufffd", "")
+    return data.decode("cp949", errors="ignore")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_filing_files(signature: tuple[tuple[Path, int, int], ...]) -> str:
+    """(파일, mtime, 크기) 목록의 내용을 파일 구분 주석과 함께 이어 붙인다."""
+    parts: list[str] = []
+    for f, _, _ in signature:
+        try:
+            data = f.read_bytes()
+        except OSError:
+            continue
+        text = _decode_filing(data)
+        if "\r" in text:
+            # read_text()와 같은 줄바꿈 정규화 (\r\n, \r → \n)
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        parts.append(f"\n<!-- FILE: {f.name} -->\n")
+        parts.append(text)
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _keyword_re(keyword: str) -> re.Pattern:
+    """본문에서 키워드를 대소문자 무시로 찾는 패턴 (HTML 전체를 lower()로 복사하지 않기 위함)."""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def _keywords_re(keywords: tuple[str, ...]) -> re.Pattern:
+    """키워드 중 하나라도 시작하는 모든 위치를 찾는 패턴.
+
+    전방탐색이라 글자를 소비하지 않으므로 다른 키워드 안에 든 키워드
+    (예: "포괄손익계산서" 안의 "손익계산서")의 위치도 빠짐없이 방문한다.
+    """
+    return re.compile("(?=" + "|".join(re.escape(kw) for kw in keywords) + ")", re.IGNORECASE)
+
+
+_TITLE_RE = re.compile(r"<TITLE[^>]*>([^<]*)</TITLE>", re.IGNORECASE)
+
+# 마지막으로 색인한 HTML과 그 <TITLE> 목록 — 추출 작업들이 같은 html 객체를 공유하므로 한 번만 만든다
+_title_index_cache: tuple[str, list[tuple[int, str]]] | None = None
+
+
+def _title_index(html: str) -> list[tuple[int, str]]:
+    """DART XML의 모든 <TITLE> 태그 (시작 위치, 소문자 제목) 목록."""
+    global _title_index_cache
+    if _title_index_cache is None or _title_index_cache[0] is not html:
+        index = [(m.start(), m.group(1).lower()) for m in _TITLE_RE.finditer(html)]
+        _title_index_cache = (html, index)
+    return _title_index_cache[1]
 
 
 def _extract_section(html: str, keywords: list[str], max_chars: int = 15000) -> str:
@@ -87,48 +371,84 @@ def _extract_section(html: str, keywords: list[str], max_chars: int = 15000) ->
     키워드는 우선순위 순서로 배열한다.
     1차: DART XML의 <TITLE> 태그 내 키워드
     2차: 일반 텍스트에서 키워드 (우선순위 순서 유지)
+
+    1차는 문서당 한 번 만드는 <TITLE> 색인(_title_index)에서 찾고, 2차는 전체
+    키워드를 묶은 패턴으로 문서를 한 번만 순회하며 키워드별 결과를 모은 뒤
+    우선순위대로 고른다.
     """
-    import re as _re
+    keywords = tuple(keywords)
 
     # 1차: TITLE 태그 내에서 키워드 찾기 (우선순위 순서)
+    titles = _title_index(html)
     for kw in keywords:
-        pattern = f"<TITLE[^>]*>[^<]*{_re.escape(kw)}[^<]*</TITLE>"
-        match = _re.search(pattern, html, _re.IGNORECASE)
-        if match:
-            idx = match.start()
-            return html[idx : min(len(html), idx + max_chars)]
+        kw_lower = kw.lower()
+        for idx, title in titles:
+            if kw_lower in title:
+                return html[idx : min(len(html), idx + max_chars)]
 
     # 2차: 일반 텍스트에서 키워드 찾기 (우선순위 순서)
     # 각 키워드의 가장 데이터가 풍부한 매칭을 찾고, 키워드 우선순위대로 반환
-    html_lower = html.lower()
-    for kw in keywords:
-        best_section = ""
-        best_score = 0
-        start_pos = 0
-
-        while True:
-            idx = html_lower.find(kw.lower(), start_pos)
-            if idx < 0:
-                break
+    kw_res = [_keyword_re(kw) for kw in keywords]
+    best: list[tuple[int, str]] = [(0, "")] * len(keywords)
+    settled: set[int] = set()  # 충분히 좋은 구간을 이미 찾은 키워드
+    next_pos = [0] * len(keywords)  # 키워드별로 매칭이 서로 겹치지 않도록 다음 탐색 시작 위치
+    for m in _keywords_re(keywords).finditer(html):
+        idx = m.start()
+        # 한 위치에서 여러 키워드가 시작할 수 있으므로 키워드마다 확인한다
+        hits = []
+        for i, kw_re in enumerate(kw_res):
+            if i in settled or idx < next_pos[i]:
+                continue
+            km = kw_re.match(html, idx)
+            if km:
+                next_pos[i] = km.end()
+                hits.append(i)
+        if not hits:
+            continue
+
+        start = max(0, idx - 200)
+        end = min(len(html), idx + max_chars)
+        section = html[start:end]
+
+        table_count = len(_TABLE_RE.findall(section))
+        number_count = len(_NUMS_RE.findall(section))
+        score = table_count * 5 + number_count
+
+        good = score > _SECTION_GOOD_SCORE and table_count >= _SECTION_GOOD_TABLES
+        for i in hits:
+            if good:
+                if i == 0:
+                    return section
+                best[i] = (score, section)
+                settled.add(i)
+            elif score > best[i][0]:
+                best[i] = (score, section)
+
+    for score, section in best:
+        if section and score > 10:
+            return section
 
-            start = max(0, idx - 200)
-            end = min(len(html), idx + max_chars)
-            section = html[start:end]
+    return ""
 
-            table_count = section.lower().count("<table")
-            number_count = len(_re.findall(r"\d{3,}", section))
-            score = table_count * 5 + number_count
 
-            if score > best_score:
-                best_score = score
-                best_section = section
+def _strip_attrs(m: re.Match) -> str:
+    spans = _SPAN_ATTR_RE.findall(m.group(0))
+    return f"<{m.group(1)} {' '.join(spans)}>" if spans else f"<{m.group(1)}>"
 
-            start_pos = idx + len(kw)
 
-        if best_section and best_score > 10:
-            return best_section
+def _compress_html(section: str) -> str:
+    """LLM에 보낼 HTML 발췌에서 의미 없는 마크업을 걷어 토큰을 줄인다.
 
-    return ""
+    style/script 블록, 글꼴·강조용 인라인 태그, 태그 속성(colspan/rowspan 제외),
+    HTML 엔티티, 연속 공백을 정리한다. 표 구조 태그와 <TITLE>은 그대로 둔다.
+    """
+    s = _STYLE_SCRIPT_RE.sub("", section)
+    s = _INLINE_TAG_RE.sub("", s)
+    s = _BR_RE.sub(" ", s)
+    s = _TAG_ATTRS_RE.sub(_strip_attrs, s)
+    s = html_lib.unescape(s)
+    s = _WS_RE.sub(" ", s)
+    return _BETWEEN_TAGS_RE.sub("><", s)
 
 
 # ---------------------------------------------------------------------------
@@ -136,7 +456,7 @@ def _extract_section(html: str, keywords: list[str], max_chars: int = 15000) ->
 # ---------------------------------------------------------------------------
 
 
-def extract_lockup_schedule(html: str) -> list[dict] | None:
+async def extract_lockup_schedule(html: str) -> list[dict] | None:
     """증권신고서에서 유통가능주식수/보호예수 테이블을 추출한다.
 
     Returns:
@@ -146,6 +466,11 @@ def extract_lockup_schedule(html: str) -> list[dict] | None:
             ...
         ]
     """
+    return await _call_json(_lockup_request(html))
+
+
+def _lockup_request(html: str) -> dict | None:
+    """유통가능주식수 추출용 _call_llm 인자. 섹션이 없으면 None."""
     # 유통가능주식 테이블은 "유통가능주식인 X주" 텍스트 바로 뒤에 나옴
     section = _extract_section(html, [
         "상장 후 유통가능 및 매각제한",   # 실제 테이블 제목
@@ -159,7 +484,7 @@ def extract_lockup_schedule(html: str) -> list[dict] | None:
         print("[LLM Parser] 유통가능주식수 섹션 찾지 못함")
         return None
 
-    prompt = """아래 증권신고서 HTML에서 유통가능주식수(보호예수/Lock-up) 테이블을 찾아서
+    prompt = """위 증권신고서 HTML에서 유통가능주식수(보호예수/Lock-up) 테이블을 찾아서
 JSON 배열로 추출해줘.
 
 각 항목은 이 형식으로:
@@ -182,12 +507,13 @@ JSON 배열로 추출해줘.
 [...]
 ```"""
 
-    result = _call_llm(
-        system="증권신고서에서 정량 데이터를 정확히 추출하는 전문가. 상장일 유통가능 물량을 반드시 포함해야 한다.",
-        user=f"{prompt}\n\n---\n\n{section[:15000]}",
-    )
-
-    return _extract_json(result)
+    return {
+        "system": "증권신고서에서 정량 데이터를 정확히 추출하는 전문가. 상장일 유통가능 물량을 반드시 포함해야 한다.",
+        "user": prompt,
+        "context": _compress_html(section)[:15000],
+        "max_tokens": 1500,
+        "model": LLM_MODEL_FAST,  # 표 옮겨 적기
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -195,7 +521,7 @@ JSON 배열로 추출해줘.
 # ---------------------------------------------------------------------------
 
 
-def extract_business_summary(html: str) -> dict | None:
+async def extract_business_summary(html: str) -> dict | None:
     """증권신고서에서 사업내용을 요약 추출한다.
 
     Returns:
@@ -207,6 +533,11 @@ def extract_business_summary(html: str) -> dict | None:
             "growth_strategy": "성장 전략/신제품 계획"
         }
     """
+    return await _call_json(_business_request(html))
+
+
+def _business_request(html: str) -> dict | None:
+    """사업내용 요약용 _call_llm 인자. 섹션이 없으면 None."""
     section = _extract_section(html, [
         "사업의 내용",       # DART TITLE: "II. 사업의 내용"
         "사업의내용",
@@ -219,7 +550,7 @@ def extract_business_summary(html: str) -> dict | None:
         print("[LLM Parser] 사업내용 섹션 찾지 못함")
         return None
 
-    prompt = """아래 증권신고서 HTML에서 사업 내용을 분석해서 JSON으로 정리해줘.
+    prompt = """위 증권신고서 HTML에서 사업 내용을 분석해서 JSON으로 정리해줘.
 
 {
     "company_overview": "설립연도, 소재지, 대표이사명, 직원 수 등 기본 정보 한 문장",
@@ -237,12 +568,12 @@ def extract_business_summary(html: str) -> dict | None:
 {...}
 ```"""
 
-    result = _call_llm(
-        system="증권신고서에서 사업 내용을 정확하고 간결하게 추출하는 전문가.",
-        user=f"{prompt}\n\n---\n\n{section[:15000]}",
-    )
-
-    return _extract_json(result)
+    return {
+        "system": "증권신고서에서 사업 내용을 정확하고 간결하게 추출하는 전문가.",
+        "user": prompt,
+        "context": _compress_html(section)[:15000],
+        "max_tokens": 1800,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -250,7 +581,7 @@ def extract_business_summary(html: str) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
-def extract_peer_valuation(html: str) -> dict | None:
+async def extract_peer_valuation(html: str) -> dict | None:
     """증권신고서에서 비교회사 Valuation 정보를 추출한다.
 
     인수인의 의견 섹션이 매우 길기 때문에 (수십만 자),
@@ -270,16 +601,25 @@ def extract_peer_valuation(html: str) -> dict | None:
             ]
         }
     """
-    # --- Pass 1: 밸류에이션 요약 추출 ---
+    # Pass 1·2는 서로 독립이라 동시에 호출
+    summary, peer_data = await asyncio.gather(
+        _call_json(_valuation_summary_request(html)),
+        _call_json(_peer_request(html)),
+    )
+    return await _build_valuation(html, summary, peer_data)
+
+
+def _valuation_summary_request(html: str) -> dict | None:
+    """Pass 1: 밸류에이션 요약 추출용 _call_llm 인자. 섹션이 없으면 None."""
     val_section = _extract_section(html, [
         "인수인의 의견",          # DART TITLE
         "비교가치",
         "공모가격에 대한 의견",
     ], max_chars=20000)
+    if not val_section:
+        return None
 
-    valuation_summary = {}
-    if val_section:
-        prompt_val = """아래 증권신고서 HTML에서 공모가 산출 요약 정보를 추출해줘.
+    prompt_val = """위 증권신고서 HTML에서 공모가 산출 요약 정보를 추출해줘.
 
 {
     "valuation_method": "공모가 산출 방법 (예: PER 비교, EV/EBITDA 등)",
@@ -296,13 +636,16 @@ def extract_peer_valuation(html: str) -> dict | None:
 ```json
 {...}
 ```"""
-        result = _call_llm(
-            system="증권신고서의 공모가 산정 요약을 정확히 추출하는 전문가.",
-            user=f"{prompt_val}\n\n---\n\n{val_section[:18000]}",
-        )
-        valuation_summary = _extract_json(result) or {}
+    return {
+        "system": "증권신고서의 공모가 산정 요약을 정확히 추출하는 전문가.",
+        "user": prompt_val,
+        "context": _compress_html(val_section)[:18000],
+        "max_tokens": 1000,
+    }
 
-    # --- Pass 2: 비교회사 개별 재무 데이터 추출 ---
+
+def _peer_request(html: str) -> dict | None:
+    """Pass 2: 비교회사 개별 재무 데이터 추출용 _call_llm 인자. 섹션이 없으면 None."""
     # "비교기업의 주요 재무현황" 테이블은 인수인의 의견 섹션 깊은 곳에 있음
     peer_section = _extract_section(html, [
         "동종업체와의 재무정보 비교",  # 증권신고서 공통 섹션
@@ -322,18 +665,21 @@ def extract_peer_valuation(html: str) -> dict | None:
         "PER 산출내역",
         "PER 산출 내역",
     ], max_chars=15000)
+    if not peer_section and not per_section:
+        return None
 
-    peers = []
-    if peer_section or per_section:
-        # 두 섹션을 합쳐서 LLM에 전달
-        combined = ""
-        if per_section:
-            combined += f"[PER 산출 영역]\n{per_section[:12000]}\n\n"
-        if peer_section:
-            combined += f"[비교기업 재무현황]\n{peer_section[:15000]}\n\n"
+    # 두 섹션을 합쳐서 LLM에 전달 — PER 영역이 재무현황 발췌에 대부분 들어 있으면 중복이므로 뺀다
+    per_text = _compress_html(per_section)[:12000] if per_section else ""
+    peer_text = _compress_html(peer_section)[:15000] if peer_section else ""
+    if per_text and peer_text and _mostly_contained(per_text, peer_text):
+        per_text = ""
+    blocks = []
+    if per_text:
+        blocks += ["[PER 산출 영역]", per_text]
+    if peer_text:
+        blocks += ["[비교기업 재무현황]", peer_text]
 
-        if combined:
-            prompt_peer = """아래 증권신고서 HTML에서 비교회사(Peer) 개별 데이터를 추출해줘.
+    prompt_peer = """위 증권신고서 HTML에서 비교회사(Peer) 개별 데이터를 추출해줘.
 
 각 비교회사별로:
 {
@@ -360,19 +706,36 @@ def extract_peer_valuation(html: str) -> dict | None:
 ```json
 {"peers": [...], "average_per": 평균PER}
 ```"""
-            result = _call_llm(
-                system="증권신고서의 비교회사 재무 데이터를 정확히 추출하는 전문가. 단위 변환을 정확히 수행한다.",
-                user=f"{prompt_peer}\n\n---\n\n{combined}",
-                max_tokens=6000,
-            )
-            peer_data = _extract_json(result)
-            if peer_data:
-                if isinstance(peer_data, dict):
-                    peers = peer_data.get("peers", [])
-                    if peer_data.get("average_per"):
-                        valuation_summary["average_peer_per"] = peer_data["average_per"]
-                elif isinstance(peer_data, list):
-                    peers = peer_data
+    return {
+        "system": "증권신고서의 비교회사 재무 데이터를 정확히 추출하는 전문가. 단위 변환을 정확히 수행한다.",
+        "user": prompt_peer,
+        "context": blocks,
+        "max_tokens": 3000,
+    }
+
+
+def _mostly_contained(part: str, whole: str, probes: int = 5, probe_len: int = 200) -> bool:
+    """part의 고르게 떨어진 조각들 중 60% 이상이 whole 안에 있으면 True (겹치는 발췌 판별)."""
+    if part in whole:
+        return True
+    if len(part) <= probe_len:
+        return False
+    step = (len(part) - probe_len) / (probes - 1)
+    found = sum(part[round(k * step):round(k * step) + probe_len] in whole for k in range(probes))
+    return found / probes >= 0.6
+
+
+async def _build_valuation(html: str, summary: dict | list | None, peer_data: dict | list | None) -> dict | None:
+    """Pass 1·2 응답을 합치고, Peer 재무가 비어 있으면 Pass 3로 보완한다."""
+    valuation_summary = summary or {}
+    peers = []
+    if peer_data:
+        if isinstance(peer_data, dict):
+            peers = peer_data.get("peers", [])
+            if peer_data.get("average_per"):
+                valuation_summary["average_peer_per"] = peer_data["average_per"]
+        elif isinstance(peer_data, list):
+            peers = peer_data
 
     if not valuation_summary and not peers:
         print("[LLM Parser] Valuation 섹션 찾지 못함")
@@ -397,35 +760,29 @@ def extract_peer_valuation(html: str) -> dict | None:
         ], max_chars=30000)
 
         # 2차: 표준 키워드로 못 찾으면 peer 이름 + 매출 키워드로 직접 탐색
-        if not fin_compare_section:
-            import re as _re
-            short_name = peer_names[0].replace("(주)", "").replace("㈜", "").strip()[:6]
-            html_lower = html.lower()
+        short_name = peer_names[0].replace("(주)", "").replace("㈜", "").strip()[:6]
+        if not fin_compare_section and short_name:
             best_section = ""
             best_score = 0
-            start_pos = 0
-            while True:
-                idx = html_lower.find(short_name.lower(), start_pos)
-                if idx < 0:
-                    break
+            for m in _keyword_re(short_name).finditer(html):
+                idx = m.start()
                 chunk = html[max(0, idx - 500):min(len(html), idx + 15000)]
                 # 매출액 + 영업이익이 같이 나오는 테이블 찾기
                 has_revenue = "매출" in chunk
                 has_profit = "영업이익" in chunk or "순이익" in chunk
-                table_count = chunk.lower().count("<table")
-                number_count = len(_re.findall(r"\d{3,}", chunk))
+                table_count = len(_TABLE_RE.findall(chunk))
+                number_count = len(_NUMS_RE.findall(chunk))
                 score = (10 if has_revenue else 0) + (10 if has_profit else 0) + table_count * 3 + number_count
                 if score > best_score and has_revenue and has_profit:
                     best_score = score
                     best_section = chunk
-                start_pos = idx + len(short_name)
             if best_section:
                 fin_compare_section = best_section
                 print(f"[LLM Parser] Peer 이름({short_name}) 기반으로 재무 테이블 발견")
 
         if fin_compare_section:
             names_str = ", ".join(peer_names)
-            prompt_fill = f"""아래 증권신고서 HTML에서 비교회사들의 재무 데이터를 찾아서 추출해줘.
+            prompt_fill = f"""위 증권신고서 HTML에서 비교회사들의 재무 데이터를 찾아서 추출해줘.
 
 대상 회사: {names_str}
 
@@ -448,10 +805,11 @@ def extract_peer_valuation(html: str) -> dict | None:
 ```json
 [...]
 ```"""
-            result = _call_llm(
+            result = await _call_llm(
                 system="증권신고서의 비교회사 재무 테이블에서 수치를 정확히 추출하는 전문가.",
-                user=f"{prompt_fill}\n\n---\n\n{fin_compare_section[:25000]}",
-                max_tokens=4096,
+                user=prompt_fill,
+                context=_compress_html(fin_compare_section)[:25000],
+                max_tokens=3000,
             )
             fill_data = _extract_json(result)
             if fill_data and isinstance(fill_data, list):
@@ -496,7 +854,7 @@ def extract_peer_valuation(html: str) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
-def extract_financials_from_filing(html: str) -> list[dict] | None:
+async def extract_financials_from_filing(html: str) -> list[dict] | None:
     """증권신고서에서 재무제표를 추출한다.
 
     DART 재무제표 API가 데이터를 반환하지 않는 미상장 기업을 위한 fallback.
@@ -508,6 +866,11 @@ def extract_financials_from_filing(html: str) -> list[dict] | None:
             ...
         ]
     """
+    return await _call_json(_financials_request(html))
+
+
+def _financials_request(html: str) -> dict | None:
+    """재무제표 추출용 _call_llm 인자. 섹션이 없으면 None."""
     # 재무제표는 여러 TITLE에 걸쳐 있을 수 있음
     section = _extract_section(html, [
         "요약 재무정보",           # DART TITLE: 가장 간결한 재무 요약 테이블
@@ -522,7 +885,7 @@ def extract_financials_from_filing(html: str) -> list[dict] | None:
         print("[LLM Parser] 재무제표 섹션 찾지 못함")
         return None
 
-    prompt = """아래 증권신고서 HTML에서 재무제표 데이터를 추출해줘.
+    prompt = """위 증권신고서 HTML에서 재무제표 데이터를 추출해줘.
 
 연도별로 다음 항목을 JSON 배열로 정리해:
 [
@@ -552,13 +915,74 @@ def extract_financials_from_filing(html: str) -> list[dict] | None:
 [...]
 ```"""
 
-    result = _call_llm(
-        system="증권신고서의 재무제표 데이터를 정확히 추출하는 전문가. 단위 변환을 정확히 수행한다.",
-        user=f"{prompt}\n\n---\n\n{section[:20000]}",
-        max_tokens=4096,
+    return {
+        "system": "증권신고서의 재무제표 데이터를 정확히 추출하는 전문가. 단위 변환을 정확히 수행한다.",
+        "user": prompt,
+        "context": _compress_html(section)[:20000],
+        "max_tokens": 2000,
+        "model": LLM_MODEL_FAST,  # 표 옮겨 적기
+    }
+
+
+# ---------------------------------------------------------------------------
+# 다중 작업 통합 추출
+# ---------------------------------------------------------------------------
+
+# (결과 키, 프롬프트 라벨, 요청 빌더) — 한 번의 호출로 묶어 보내는 작업들
+# 유통가능주식수(표 옮겨 적기)는 빠른 모델로 따로 보내므로 통합 호출에서 뺀다
+_COMBINED_TASKS = (
+    ("business", "BUSINESS", _business_request),
+    ("valuation", "VALUATION", _valuation_summary_request),
+)
+
+
+async def extract_all_sections(html: str) -> dict:
+    """사업내용·밸류에이션 요약을 한 번의 호출로 추출한다.
+
+    작업마다 따로 호출하면 시스템 프롬프트·지시문 비용을 매번 다시 내므로,
+    섹션 발췌를 "### SECTION k ###"로, 지시를 "### TASK k: ..."로 이어 붙여
+    하나의 JSON 객체로 받는다. 통합 응답에 어떤 작업의 키가 없으면(JSON 파싱 실패 포함)
+    그 작업만 개별 호출로 다시 추출한다.
+
+    Returns:
+        {"business": {...} | None, "valuation": {...} | None}
+    """
+    out = {task: None for task, _, _ in _COMBINED_TASKS}
+    present = [(task, label, req) for task, label, build in _COMBINED_TASKS if (req := build(html))]
+    if not present:
+        return out
+
+    sections, instructions = [], []
+    for k, (task, label, req) in enumerate(present, 1):
+        sections += [f"### SECTION {k} ###", req["context"]]
+        instructions.append(f"### TASK {k}: {label} (SECTION {k} 참고)\n{req['user']}")
+    keys = ", ".join(f'"{task}": ...' for task, _, _ in present)
+    instructions.append(
+        "### 출력 형식\n"
+        "위 TASK들의 결과를 하나의 ```json 블록에 담아줘. "
+        f"키는 다음과 같고 각 값은 해당 TASK의 JSON 형식을 따른다: {{{keys}}}"
     )
 
-    return _extract_json(result)
+    result = _extract_json(await _call_llm(
+        system=" ".join(req["system"] for _, _, req in present),
+        user="\n\n".join(instructions),
+        context=sections,
+        max_tokens=sum(req["max_tokens"] for _, _, req in present),
+    ))
+    if not isinstance(result, dict):
+        result = {}
+
+    retry = []
+    for task, label, req in present:
+        out[task] = result.get(task)
+        if out[task] is None:
+            print(f"[LLM Parser] 통합 추출 결과에 {label} 없음 → 개별 호출")
+            retry.append((task, req))
+    if retry:
+        values = await asyncio.gather(*(_call_json(req) for _, req in retry))
+        for (task, _), value in zip(retry, values):
+            out[task] = value
+    return out
 
 
 # ---------------------------------------------------------------------------
@@ -566,13 +990,19 @@ def extract_financials_from_filing(html: str) -> list[dict] | None:
 # ---------------------------------------------------------------------------
 
 
-def parse_full_filing(filing_dir: Path, need_financials: bool = False) -> dict:
+async def parse_full_filing(filing_dir: Path, need_financials: bool = False, batch: bool = False) -> dict:
     """증권신고서 HTML 전체를 파싱하여 구조화된 데이터를 반환한다.
 
+    서로 독립인 추출 호출(유통가능주식수·통합 추출·Peer 테이블·재무제표)은 동시에 보낸다.
+
     Args:
         filing_dir: 증권신고서 HTML 파일이 있는 디렉토리
         need_financials: True이면 재무제표도 LLM으로 추출 (DART API fallback)
+        batch: True이면 Message Batches API로 제출 (비용 50%, 결과까지 수 분~수 시간)
     """
+    if batch:
+        return (await parse_full_filing_batched([filing_dir], need_financials=need_financials))[0]
+
     html = load_filing_html(filing_dir)
     if not html:
         print("[LLM Parser] HTML 파일 없음")
@@ -582,29 +1012,136 @@ def parse_full_filing(filing_dir: Path, need_financials: bool = False) -> dict:
 
     result = {}
 
-    print("[LLM Parser] 유통가능주식수 추출 중...")
-    lockup = extract_lockup_schedule(html)
+    print("[LLM Parser] 유통가능주식수·사업내용·Peer Valuation 추출 중...")
+    if need_financials:
+        print("[LLM Parser] 재무제표 추출 중 (DART API fallback)...")
+    lockup, sections, peer_data, financials = await asyncio.gather(
+        extract_lockup_schedule(html),
+        extract_all_sections(html),
+        _call_json(_peer_request(html)),
+        extract_financials_from_filing(html) if need_financials else _none(),
+    )
+    valuation = await _build_valuation(html, sections["valuation"], peer_data)
+
     if lockup:
         result["lockup_schedule"] = lockup
-        print(f"  → {len(lockup)}개 항목 추출")
-
-    print("[LLM Parser] 사업내용 추출 중...")
-    business = extract_business_summary(html)
+        print(f"  → 유통가능주식수 {len(lockup)}개 항목 추출")
+    business = sections["business"]
     if business:
         result["business"] = business
-        print("  → 추출 완료")
-
-    print("[LLM Parser] Peer Valuation 추출 중...")
-    valuation = extract_peer_valuation(html)
+        print("  → 사업내용 추출 완료")
     if valuation:
         result["valuation"] = valuation
-        print("  → 추출 완료")
+        print("  → Peer Valuation 추출 완료")
+    if financials:
+        result["filing_financials"] = financials
+        print(f"  → 재무제표 {len(financials)}개 연도 추출")
+
+    return result
+
+
+def parse_full_filing_sync(filing_dir: Path, need_financials: bool = False, batch: bool = False) -> dict:
+    """이벤트 루프 밖(동기 코드)에서 parse_full_filing을 실행한다."""
+    async def run() -> dict:
+        try:
+            return await parse_full_filing(filing_dir, need_financials=need_financials, batch=batch)
+        finally:
+            await aclose_client()
+
+    return asyncio.run(run())
 
+
+# ---------------------------------------------------------------------------
+# 일괄 파싱 (Message Batches API)
+# ---------------------------------------------------------------------------
+
+_BATCH_POLL_SECONDS = 30
+
+
+def _filing_requests(html: str, need_financials: bool) -> dict[str, dict]:
+    """증권신고서 하나에 대한 작업별 _call_llm 인자. 섹션이 없는 작업은 빠진다."""
+    requests = {
+        "lockup": _lockup_request(html),
+        "business": _business_request(html),
+        "valuation": _valuation_summary_request(html),
+        "peers": _peer_request(html),
+    }
     if need_financials:
-        print("[LLM Parser] 재무제표 추출 중 (DART API fallback)...")
-        financials = extract_financials_from_filing(html)
-        if financials:
-            result["filing_financials"] = financials
-            print(f"  → {len(financials)}개 연도 추출")
+        requests["financials"] = _financials_request(html)
+    return {task: req for task, req in requests.items() if req}
+
+
+async def _assemble_filing(html: str, requests: dict[str, dict], texts: dict[str, str]) -> dict:
+    """작업별 LLM 응답 텍스트를 parse_full_filing과 같은 형태로 합친다."""
+    parsed = {task: _extract_json(text) for task, text in texts.items()}
+
+    # 빠른 모델 작업이 실패(요청 오류·JSON 파싱 실패)했으면 기본 모델로 재시도
+    retry = [
+        task for task, req in requests.items()
+        if req.get("model") == LLM_MODEL_FAST and parsed.get(task) is None
+    ]
+    if retry:
+        print(f"[LLM Parser] 빠른 모델 결과 없음 → 기본 모델로 재시도: {retry}")
+        values = await asyncio.gather(*(
+            _call_json({**requests[task], "model": LLM_MODEL_SMART}) for task in retry
+        ))
+        parsed.update(zip(retry, values))
 
+    result = {}
+    if parsed.get("lockup"):
+        result["lockup_schedule"] = parsed["lockup"]
+    if parsed.get("business"):
+        result["business"] = parsed["business"]
+    # Pass 3(Peer 재무 보완)는 앞 결과에 따라 필요할 때만 실행되므로 일반 호출로 처리
+    valuation = await _build_valuation(html, parsed.get("valuation"), parsed.get("peers"))
+    if valuation:
+        result["valuation"] = valuation
+    if parsed.get("financials"):
+        result["filing_financials"] = parsed["financials"]
     return result
+
+
+async def parse_full_filing_batched(filing_dirs: list[Path], need_financials: bool = False) -> list[dict]:
+    """여러 증권신고서의 추출 작업을 Message Batches API 한 건으로 제출한다.
+
+    (증권신고서, 작업)마다 요청 하나를 만들어 일괄 제출하고, 처리가 끝날 때까지
+    기다린 뒤 custom_id로 결과를 나눠 담는다. 토큰 단가가 절반이라 여러 종목을
+    한꺼번에 파싱할 때 쓴다. 대화형 단일 실행은 parse_full_filing을 쓸 것.
+
+    Returns:
+        filing_dirs와 같은 순서의 parse_full_filing 결과 목록
+    """
+    htmls = [load_filing_html(d) for d in filing_dirs]
+
+    per_filing: list[dict[str, dict]] = [{} for _ in filing_dirs]
+    requests = []
+    for i, (filing_dir, html) in enumerate(zip(filing_dirs, htmls)):
+        if not html:
+            print(f"[LLM Parser] HTML 파일 없음: {filing_dir}")
+            continue
+        per_filing[i] = _filing_requests(html, need_financials)
+        for task, req in per_filing[i].items():
+            requests.append({"custom_id": f"{i}-{task}", "params": _llm_params(**req)})
+
+    texts: list[dict[str, str]] = [{} for _ in filing_dirs]
+    if requests:
+        batches = _get_client().messages.batches
+        batch = await batches.create(requests=requests)
+        print(f"[LLM Parser] Batch 제출: {batch.id} ({len(requests)}건)")
+        while batch.processing_status != "ended":
+            await asyncio.sleep(_BATCH_POLL_SECONDS)
+            batch = await batches.retrieve(batch.id)
+        print(f"[LLM Parser] Batch 완료: {batch.request_counts.succeeded}/{len(requests)}건 성공")
+
+        async for entry in await batches.results(batch.id):
+            idx, task = entry.custom_id.split("-", 1)
+            if entry.result.type == "succeeded":
+                texts[int(idx)][task] = _message_text(entry.result.message)
+            else:
+                print(f"[LLM Parser] Batch 요청 실패: {entry.custom_id} ({entry.result.type})")
+
+    results = await asyncio.gather(*(
+        _assemble_filing(html, reqs, t) if html else _none()
+        for html, reqs, t in zip(htmls, per_filing, texts)
+    ))
+    return [r or {} for r in results]
@@ -3,13 +3,18 @@
 DART 지분증권 API + 38.co.kr 데이터를 통합 정리한다.
 """
 
-import re
+from collections.abc import Callable
+
+# 숫자 문자열에서 한 번에 지울 문자 (콤마·공백류·단위)
+_WS = " \t\n\r\x0b\x0c\xa0\u3000"
+_NUM_STRIP_TBL = str.maketrans("", "", ",원주배%" + _WS)
+_FLOAT_STRIP_TBL = str.maketrans("", "", ",%" + _WS)
 
 
 def _clean_num(val: str | None) -> int | None:
     if not val:
         return None
-    cleaned = re.sub(r"[,\s원주배%]", "", val.strip())
+    cleaned = val.translate(_NUM_STRIP_TBL)
     if not cleaned or cleaned == "-":
         return None
     try:
@@ -24,7 +29,7 @@ def _clean_num(val: str | None) -> int | None:
 def _clean_float(val: str | None) -> float | None:
     if not val:
         return None
-    cleaned = re.sub(r"[,\s%]", "", val.strip())
+    cleaned = val.translate(_FLOAT_STRIP_TBL)
     if not cleaned or cleaned == "-":
         return None
     try:
@@ -33,6 +38,54 @@ def _clean_float(val: str | None) -> float | None:
         return None
 
 
+# 목록형 응답의 필드 매핑: (결과 키, API 필드, 변환 함수 — None이면 문자열 그대로)
+_RowFields = tuple[tuple[str, str, Callable[[str | None], int | None] | None], ...]
+
+_ROW_FIELDS: dict[str, _RowFields] = {
+    # 증권의종류 (공모가 정보)
+    "securities": (
+        ("type", "stksen", None),
+        ("count", "stkcnt", _clean_num),
+        ("face_value", "fv", _clean_num),
+        ("offering_price", "slprc", _clean_num),
+        ("total_amount", "slta", _clean_num),
+        ("method", "slmthn", None),
+    ),
+    # 인수인 (주관사)
+    "underwriters": (
+        ("type", "actsen", None),
+        ("name", "actnmn", None),
+        ("count", "udtcnt", _clean_num),
+        ("amount", "udtamt", _clean_num),
+        ("method", "udtmth", None),
+    ),
+    # 자금의사용목적
+    "fund_usage": (
+        ("category", "se", None),
+        ("amount", "amt", _clean_num),
+    ),
+    # 매출인 (구주매출)
+    "sellers": (
+        ("holder", "hdr", None),
+        ("relationship", "rl_cmp", None),
+        ("before_sale", "bfsl_hdstk", _clean_num),
+        ("sold", "slstk", _clean_num),
+        ("after_sale", "atsl_hdstk", _clean_num),
+    ),
+}
+
+
+def _map_rows(rows: list[dict], fields: _RowFields) -> list[dict]:
+    """API 행 목록을 필드 매핑대로 변환한다."""
+    return [
+        {
+            key: conv(item.get(src)) if conv else item.get(src, "")
+            for key, src, conv in fields
+        }
+        for item in rows
+    ]
+
+
 def parse_equity_registration(data: dict) -> dict:
     """DART estkRs API 응답을 정리한다.
 
@@ -45,7 +98,7 @@ def parse_equity_registration(data: dict) -> dict:
             "fund_usage": [{"category": "시설자금", "amount": ...}],
         }
     """
-    result = {}
+    result: dict = {}
 
     # 일반사항
     for item in data.get("general", []):
@@ -53,51 +106,8 @@ def parse_equity_registration(data: dict) -> dict:
         result["payment_date"] = item.get("pymd", "")
         result["subscription_announcement"] = item.get("sband", "")
 
-    # 증권의종류 (공모가 정보)
-    securities = []
-    for item in data.get("securities", []):
-        securities.append({
-            "type": item.get("stksen", ""),
-            "count": _clean_num(item.get("stkcnt")),
-            "face_value": _clean_num(item.get("fv")),
-            "offering_price": _clean_num(item.get("slprc")),
-            "total_amount": _clean_num(item.get("slta")),
-            "method": item.get("slmthn", ""),
-        })
-    result["securities"] = securities
-
-    # 인수인 (주관사)
-    underwriters = []
-    for item in data.get("underwriters", []):
-        underwriters.append({
-            "type": item.get("actsen", ""),
-            "name": item.get("actnmn", ""),
-            "count": _clean_num(item.get("udtcnt")),
-            "amount": _clean_num(item.get("udtamt")),
-            "method": item.get("udtmth", ""),
-        })
-    result["underwriters"] = underwriters
-
-    # 자금의사용목적
-    fund_usage = []
-    for item in data.get("fund_usage", []):
-        fund_usage.append({
-            "category": item.get("se", ""),
-            "amount": _clean_num(item.get("amt")),
-        })
-    result["fund_usage"] = fund_usage
-
-    # 매출인 (구주매출)
-    sellers = []
-    for item in data.get("sellers", []):
-        sellers.append({
-            "holder": item.get("hdr", ""),
-            "relationship": item.get("rl_cmp", ""),
-            "before_sale": _clean_num(item.get("bfsl_hdstk")),
-            "sold": _clean_num(item.get("slstk")),
-            "after_sale": _clean_num(item.get("atsl_hdstk")),
-        })
-    result["sellers"] = sellers
+    for key, fields in _ROW_FIELDS.items():
+        result[key] = _map_rows(data.get(key, []), fields)
 
     return result
 
@@ -110,7 +120,7 @@ def merge_offering_data(dart_data: dict, crawler_data: dict | None) -> dict:
         return merged
 
     # 38.co.kr에서만 얻을 수 있는 데이터
-    extra_fields = {
+    extra_fields: dict[str, str] = {
         "confirmed_price": "확정공모가",
         "institutional_competition": "기관경쟁률",
         "lockup_commitment": "의무보유확약비율",
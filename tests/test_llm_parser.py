@@ -0,0 +1,19 @@
+"""parsers.llm_parser JSON 추출 회귀 테스트"""
+
+from parsers.llm_parser import _extract_json
+
+
+def test_object_preferred_over_earlier_array():
+    assert _extract_json('Note [1]: result is {"a": 1}') == {"a": 1}
+
+
+def test_unclosed_bracket_skipped():
+    assert _extract_json('단위: [백만원\n{"a": 1}') == {"a": 1}
+
+
+def test_array_of_objects_kept_whole():
+    assert _extract_json('결과: [{"p": 1}, {"p": 2}] 입니다') == [{"p": 1}, {"p": 2}]
+
+
+def test_fenced_block():
+    assert _extract_json('설명\n```json\n{"a": [1, 2]}\n```\n\n') == {"a": [1, 2]}